@@ -0,0 +1,69 @@
+import asyncio
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.dependencies import get_db, get_read_db
+from app.rag.NearDuplicateIndex import NearDuplicateIndex
+from app.rag.RetrievalCache import RetrievalCache
+from app.rag.VectorStore import VectorStore
+from app.rag.constants.enum import NearDuplicatePolicy
+from app.schemas.document import DocumentResponse
+from app.services.document_service import DocumentService
+from app.utils.http_status import HTTPStatus
+
+router = APIRouter(prefix="/documents", tags=["documents"])
+
+
+@router.get("/{document_id}", response_model=DocumentResponse)
+async def get_document(
+    document_id: UUID,
+    db: AsyncSession = Depends(get_read_db)
+) -> DocumentResponse:
+    """
+    Get a document and its ingestion status.
+
+    Raises:
+    - 404 Not Found: If the document does not exist
+    """
+    document = await DocumentService.get_by_id(db, document_id)
+    if not document:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Document with id {document_id} not found"
+        )
+    return DocumentResponse.model_validate(document)
+
+
+@router.delete("/{document_id}", status_code=HTTPStatus.NO_CONTENT)
+async def delete_document(
+    document_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete a document together with all of its parent chunks, their
+    vectors and their near-duplicate index entries.
+
+    Raises:
+    - 404 Not Found: If the document does not exist
+    """
+    removed = await DocumentService.delete(db, document_id)
+    if removed is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Document with id {document_id} not found"
+        )
+
+    chunk_ids = [str(chunk_id) for chunk_id in removed]
+    store = VectorStore.get_default()
+    if await asyncio.to_thread(store.remove_parents, chunk_ids):
+        await asyncio.to_thread(store.save)
+    if NearDuplicatePolicy(settings.NEAR_DUPLICATE_POLICY) != NearDuplicatePolicy.OFF:
+        near_duplicates = NearDuplicateIndex.get_default()
+        if await asyncio.to_thread(near_duplicates.remove, chunk_ids):
+            await asyncio.to_thread(near_duplicates.save)
+    await RetrievalCache.invalidate_default()
+
+    return None
@@ -0,0 +1,67 @@
+import json
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import ReadSessionLocal
+from app.dependencies import get_read_db
+from app.schemas.parent_chunk import ParentChunkPage, ParentChunkResponse, ParentChunkSummary
+from app.services.parent_chunk_service import ParentChunkService
+from app.utils.http_status import HTTPStatus
+
+router = APIRouter(prefix="/parent-chunks", tags=["parent-chunks"])
+
+
+@router.get("/", response_model=ParentChunkPage)
+async def list_parent_chunks(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    summary: bool = Query(False, description="Omit chunk content"),
+    db: AsyncSession = Depends(get_read_db)
+) -> ParentChunkPage:
+    """
+    List parent chunks ordered by chunk_index using keyset pagination.
+
+    Raises:
+    - 400 Bad Request: If the cursor is malformed
+    """
+    try:
+        rows, next_cursor = await ParentChunkService.get_page(
+            db, limit=limit, cursor=cursor, summary=summary)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=str(e)
+        )
+
+    schema = ParentChunkSummary if summary else ParentChunkResponse
+    return ParentChunkPage(
+        items=[schema.model_validate(row) for row in rows],
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_parent_chunks(
+    summary: bool = Query(False, description="Omit chunk content")
+) -> StreamingResponse:
+    """
+    Export all parent chunks as NDJSON (one JSON object per line), ordered
+    by chunk_index. Rows are streamed from a server-side cursor, so memory
+    use is constant regardless of table size.
+    """
+    async def generate() -> AsyncIterator[bytes]:
+        # The session must live as long as the stream, not the request scope
+        async with ReadSessionLocal() as db:
+            async for rows in ParentChunkService.stream_all(db, summary=summary):
+                yield "".join(
+                    json.dumps(dict(row._mapping), default=str) + "\n" for row in rows
+                ).encode("utf-8")
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="parent_chunks.ndjson"'}
+    )
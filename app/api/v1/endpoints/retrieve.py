@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.dependencies import get_read_db
+from app.rag.RagFacade import RagFacade
+from app.rag.constants.enum import RetrievalMode
+from app.schemas.retrieve import RetrieveRequest, RetrieveResponse
+
+router = APIRouter(prefix="/retrieve", tags=["retrieve"])
+
+
+@router.post("/", response_model=RetrieveResponse)
+async def retrieve(
+    request: RetrieveRequest,
+    db: AsyncSession = Depends(get_read_db)
+) -> RetrieveResponse:
+    """
+    Retrieve the parent chunks that best match a query.
+
+    Child hits are collapsed to distinct parents in rank order; hot parents
+    are served from the in-process parent cache. With token_budget, the
+    results are packed to fit the budget using token counts stored at
+    ingest; total_tokens is what the results use against it.
+    """
+    mode = request.mode or RetrievalMode(settings.RETRIEVAL_MODE)
+    results = await RagFacade.retrieve(db, request.query, request.top_k, mode)
+    results, total_tokens = RagFacade.pack_context(results, request.token_budget)
+    return RetrieveResponse(
+        query=request.query,
+        mode=mode,
+        results=results,
+        total_tokens=total_tokens
+    )
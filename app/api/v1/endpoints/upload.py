@@ -1,62 +1,176 @@
 import uuid
 from datetime import datetime
 from pathlib import Path
+from typing import Optional, Tuple
+from uuid import UUID
 
-from fastapi import APIRouter, File, UploadFile, HTTPException
+from fastapi import APIRouter, Depends, File, Response, UploadFile, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.core.metrics import span
+from app.dependencies import get_db
 from app.utils.http_status import HTTPStatus
-from app.schemas.upload import UploadResponse
-from app.rag.RagFacade import RagFacade
+from app.utils.file_storage import StoredFile, stream_upload_to_disk
+from app.models.document import Document
+from app.schemas.document import DocumentCreate
+from app.schemas.upload import UploadResponse, IngestionJobResponse
+from app.rag.FileTypeDetector import HEAD_SIZE, TAIL_SIZE, FileTypeDetector
+from app.rag.RagException import IngestionQueueFullException, LoaderNotFoundException
+from app.rag.constants.enum import DocumentType, IngestionStatus
+from app.services.document_service import DocumentService
+from app.services.ingestion_service import IngestionJob, ingestion_service
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
-# Maximum file size: 1MB in bytes
-MAX_FILE_SIZE = 1 * 1024 * 1024  # 1MB = 1,048,576 bytes
+# Maximum file size in bytes; uploads are streamed so this no longer
+# bounds per-request memory
+MAX_FILE_SIZE = settings.MAX_UPLOAD_SIZE
 
 # Upload directory
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
 
-@router.post("/", response_model=UploadResponse, status_code=HTTPStatus.CREATED)
+@router.post("/", response_model=UploadResponse, status_code=HTTPStatus.ACCEPTED)
 async def upload_file(
-    file: UploadFile = File(..., description="File to upload (max 1MB)")
+    response: Response,
+    file: UploadFile = File(..., description="File to upload"),
+    db: AsyncSession = Depends(get_db)
 ) -> UploadResponse:
     """
-    Upload a file with maximum size of 1MB.
+    Upload a file of at most MAX_UPLOAD_SIZE bytes, register it as a new
+    document and queue it for ingestion.
+    The body is streamed to disk in chunks and hashed on the fly. If a
+    document with the same SHA-256 exists and has not failed, the upload is
+    discarded and that document is returned with 200 instead of 202.
     - **file**: The file to upload (required)
     Returns:
-    - Upload metadata including filename, size, path, and upload timestamp
+    - Upload metadata including filename, size, SHA-256, path, upload timestamp,
+      the document id and the ingestion job id to poll at `/upload/jobs/{job_id}`
     Raises:
-    - 413 Payload Too Large: If file size exceeds 1MB
+    - 413 Payload Too Large: If file size exceeds MAX_UPLOAD_SIZE
     - 400 Bad Request: If no file is provided or file is empty
+    - 415 Unsupported Media Type: If the file is not a PDF, DOC, DOCX or
+      UTF-8 text file
+    - 503 Service Unavailable: If the ingestion queue is full
     """
+    file_path, stored, document_type = await _store_upload(file)
 
-    # Check if filename is empty
-    if not file.filename:
+    # Identical bytes were already ingested (or are being); reuse them
+    existing = await DocumentService.get_by_file_hash(db, stored.sha256)
+    if existing:
+        file_path.unlink(missing_ok=True)
+        response.status_code = HTTPStatus.OK
+        return _duplicate_response(file, stored, existing)
+
+    try:
+        document = await DocumentService.create(
+            db, _document_data(file, file_path, stored, document_type))
+    except IntegrityError:
+        # A concurrent upload of the same bytes registered its document
+        # between the lookup above and this insert
+        await db.rollback()
+        file_path.unlink(missing_ok=True)
+        existing = await DocumentService.get_by_file_hash(db, stored.sha256)
+        if existing is None:
+            raise
+        response.status_code = HTTPStatus.OK
+        return _duplicate_response(file, stored, existing)
+
+    # Queue ingestion; parsing and splitting run in the worker pool
+    try:
+        job = _enqueue(file_path, document.id, document_type, replace=False)
+    except HTTPException:
+        await DocumentService.delete(db, document.id)
+        file_path.unlink(missing_ok=True)
+        raise
+
+    return _upload_response(file, stored, document, job)
+
+
+@router.put("/{document_id}", response_model=UploadResponse, status_code=HTTPStatus.ACCEPTED)
+async def reupload_file(
+    response: Response,
+    document_id: UUID,
+    file: UploadFile = File(..., description="New version of the document"),
+    db: AsyncSession = Depends(get_db)
+) -> UploadResponse:
+    """
+    Upload a new version of an existing document and queue an incremental
+    re-ingest: only chunks whose content changed are inserted and embedded,
+    removed ones are deleted and moved ones re-positioned. The document keeps
+    serving its current chunks until the job commits these in one transaction.
+    Re-uploads of a document still being ingested wait for that job, and the
+    replaced file is deleted once the new version is committed.
+    Uploading the contents the document already holds is a no-op that
+    returns 200.
+    - **document_id**: ID of the document to replace
+    - **file**: The new file (required)
+    Raises:
+    - 404 Not Found: If the document does not exist
+    - 409 Conflict: If another document already holds identical contents
+    - 413 Payload Too Large: If file size exceeds MAX_UPLOAD_SIZE
+    - 400 Bad Request: If no file is provided or file is empty
+    - 415 Unsupported Media Type: If the file is not a PDF, DOC, DOCX or
+      UTF-8 text file
+    - 503 Service Unavailable: If the ingestion queue is full
+    """
+    current = await DocumentService.get_by_id(db, document_id)
+    if not current:
         raise HTTPException(
-            status_code=HTTPStatus.BAD_REQUEST,
-            detail="Invalid file: filename is empty"
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Document with id {document_id} not found"
         )
 
-    # Read file content
-    file_content = await file.read()
-    file_size = len(file_content)
+    file_path, stored, document_type = await _store_upload(file)
 
-    # Validate file size
-    if file_size == 0:
+    if current.file_hash == stored.sha256 and current.status != IngestionStatus.FAILED.value:
+        file_path.unlink(missing_ok=True)
+        response.status_code = HTTPStatus.OK
+        return _duplicate_response(file, stored, current)
+
+    superseded_path = Path(current.file_path)
+    try:
+        document = await DocumentService.update_source(
+            db, document_id, _document_data(file, file_path, stored, document_type))
+    except IntegrityError:
+        await db.rollback()
+        file_path.unlink(missing_ok=True)
+        existing = await DocumentService.get_by_file_hash(db, stored.sha256)
+        detail = "Identical file already registered as another document"
+        if existing:
+            detail = f"Identical file already registered as document {existing.id}"
+        raise HTTPException(status_code=HTTPStatus.CONFLICT, detail=detail)
+    if not document:
+        file_path.unlink(missing_ok=True)
         raise HTTPException(
-            status_code=HTTPStatus.BAD_REQUEST,
-            detail="File is empty"
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Document with id {document_id} not found"
         )
 
-    if file_size > MAX_FILE_SIZE:
+    try:
+        job = _enqueue(
+            file_path, document.id, document_type, replace=True,
+            superseded_path=superseded_path)
+    except HTTPException:
+        await DocumentService.update_status(db, document.id, IngestionStatus.FAILED)
+        raise
+
+    return _upload_response(file, stored, document, job)
+
+
+async def _store_upload(file: UploadFile) -> Tuple[Path, StoredFile, DocumentType]:
+    """
+    Validate and stream an upload to a uniquely named file in UPLOAD_DIR,
+    then detect its type from the head and tail bytes kept while streaming.
+    """
+    # Check if filename is empty
+    if not file.filename:
         raise HTTPException(
-            status_code=HTTPStatus.PAYLOAD_TOO_LARGE,
-            detail=(
-                f"File size ({file_size} bytes) exceeds maximum allowed size of "
-                f"{MAX_FILE_SIZE} bytes (1MB)"
-            )
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Invalid file: filename is empty"
         )
 
     # Generate unique filename to avoid conflicts
@@ -64,28 +178,142 @@ async def upload_file(
     unique_filename = f"{uuid.uuid4()}{file_extension}"
     file_path = UPLOAD_DIR / unique_filename
 
-    # Save file to disk
+    # Stream file to disk, enforcing the size limit as bytes arrive
     try:
-        with open(file_path, "wb") as f:
-            f.write(file_content)
+        with span("upload.write"):
+            stored = await stream_upload_to_disk(
+                file, file_path, MAX_FILE_SIZE, settings.UPLOAD_CHUNK_SIZE,
+                head_size=HEAD_SIZE, tail_size=TAIL_SIZE)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
             detail=f"Failed to save file: {str(e)}"
         )
-    RagFacade.ingest(file_path)
-    # Prepare response
-    upload_response = UploadResponse(
-        filename=unique_filename,
+
+    # Validate file size
+    if stored.size == 0:
+        file_path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="File is empty"
+        )
+
+    # Reject unsupported files before they are registered or parsed
+    try:
+        with span("upload.detect"):
+            document_type = FileTypeDetector.detect(stored.head, stored.tail, stored.size)
+    except LoaderNotFoundException as e:
+        file_path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+            detail=e.message
+        )
+
+    return file_path, stored, document_type
+
+
+def _document_data(
+    file: UploadFile,
+    file_path: Path,
+    stored: StoredFile,
+    document_type: DocumentType
+) -> DocumentCreate:
+    return DocumentCreate(
+        file_hash=stored.sha256,
+        filename=file.filename,
+        file_path=str(file_path),
+        file_size=stored.size,
+        document_type=document_type.value
+    )
+
+
+def _enqueue(
+    file_path: Path,
+    document_id: UUID,
+    document_type: DocumentType,
+    replace: bool,
+    superseded_path: Optional[Path] = None
+) -> IngestionJob:
+    try:
+        with span("upload.enqueue"):
+            return ingestion_service.submit(
+                file_path, document_id, replace=replace, document_type=document_type,
+                superseded_path=superseded_path)
+    except IngestionQueueFullException as e:
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail=e.message
+        )
+
+
+def _upload_response(
+    file: UploadFile,
+    stored: StoredFile,
+    document: Document,
+    job: Optional[IngestionJob],
+    duplicate: bool = False
+) -> UploadResponse:
+    file_path = Path(document.file_path)
+    return UploadResponse(
+        filename=file_path.name,
         original_filename=file.filename,
         file_path=str(file_path),
-        file_size=file_size,
+        file_size=stored.size,
+        file_hash=stored.sha256,
         content_type=file.content_type or "application/octet-stream",
         uploaded_at=datetime.utcnow(),
-        message="File uploaded successfully"
+        document_id=document.id,
+        job_id=job.id if job else None,
+        job_status=job.status.value if job else document.status,
+        duplicate=duplicate,
+        message=(
+            "Identical file already ingested, existing document returned"
+            if duplicate else "File uploaded successfully, ingestion queued"
+        )
     )
 
-    return upload_response
+
+def _duplicate_response(file: UploadFile, stored: StoredFile, document: Document) -> UploadResponse:
+    return _upload_response(
+        file, stored, document,
+        ingestion_service.get_latest_job(document.id),
+        duplicate=True
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job(job_id: str) -> IngestionJobResponse:
+    """
+    Get the status of an ingestion job.
+
+    Raises:
+    - 404 Not Found: If the job is unknown or has been evicted from history
+    """
+    job = ingestion_service.get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Ingestion job with id {job_id} not found"
+        )
+
+    return IngestionJobResponse(
+        job_id=job.id,
+        document_id=job.document_id,
+        status=job.status.value,
+        file_path=str(job.file_path),
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        parent_chunk_count=job.parent_chunk_count,
+        child_chunk_count=job.child_chunk_count,
+        duplicate_chunk_count=job.duplicate_chunk_count,
+        near_duplicate_chunk_count=job.near_duplicate_chunk_count,
+        moved_chunk_count=job.moved_chunk_count,
+        removed_chunk_count=job.removed_chunk_count,
+        error=job.error
+    )
 
 
 @router.get("/info")
@@ -101,5 +329,5 @@ async def get_upload_info():
         "max_file_size_bytes": MAX_FILE_SIZE,
         "max_file_size_mb": MAX_FILE_SIZE / (1024 * 1024),
         "upload_directory": str(UPLOAD_DIR.absolute()),
-        "allowed_methods": ["POST"]
+        "allowed_methods": ["POST", "PUT"]
     }
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import example, upload
+from app.api.v1.endpoints import documents, example, parent_chunks, retrieve, upload
 
 # Create main API router
 api_router = APIRouter()
@@ -7,6 +7,9 @@ api_router = APIRouter()
 # Include all endpoint routers
 api_router.include_router(example.router)
 api_router.include_router(upload.router)
+api_router.include_router(parent_chunks.router)
+api_router.include_router(documents.router)
+api_router.include_router(retrieve.router)
 
 # Add more routers here as you create them:
 # api_router.include_router(notebooks.router)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Any, Dict, List
 import os
 
 
@@ -18,6 +18,14 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     DATABASE_URL: str
     SYNC_DATABASE_URL: str | None = None
+    DATABASE_READ_URL: str | None = None  # read replica; defaults to DATABASE_URL
+    DB_ECHO: bool = False  # log every SQL statement; keep off in production
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a pooled connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements per connection
     # Security
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
@@ -31,6 +39,60 @@ class Settings(BaseSettings):
     # File Upload
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
     UPLOAD_DIR: str = "./uploads"
+    UPLOAD_CHUNK_SIZE: int = 1048576  # 1MB read per streaming iteration
+    # Instrumentation (Prometheus /metrics and Server-Timing headers)
+    METRICS_ENABLED: bool = True
+    # Hydrated parent chunks served to retrieval
+    PARENT_CACHE_SIZE: int = 10000
+    PARENT_CACHE_TTL: int = 300  # seconds
+    # Near-duplicate parent chunk detection (MinHash signatures + LSH)
+    NEAR_DUPLICATE_POLICY: str = "cluster"  # "off", "cluster" or "skip"
+    NEAR_DUPLICATE_THRESHOLD: float = 0.8  # estimated Jaccard similarity
+    NEAR_DUPLICATE_BANDS: int = 16
+    NEAR_DUPLICATE_INDEX_DIR: str = "./near_duplicate_index"
+    MINHASH_NUM_PERM: int = 128  # changing it invalidates stored signatures
+    MINHASH_SHINGLE_SIZE: int = 3  # words per shingle
+    # PDF extraction: page shards run in a process pool above the threshold
+    PDF_PARALLEL_WORKERS: int = 4
+    PDF_PARALLEL_MIN_PAGES: int = 32
+    PDF_PAGES_PER_SHARD: int = 8
+    # Chunking profiles per document type, overriding the defaults in
+    # app/rag/ChunkingProfileRegistry.py (JSON in the environment)
+    CHUNKING_PROFILES: Dict[str, Dict[str, Any]] = {}
+    # Embeddings
+    EMBEDDING_BACKEND: str = "hashing"
+    EMBEDDING_DIM: int = 384
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_MAX_CONCURRENCY: int = 4
+    EMBEDDING_CACHE_SIZE: int = 50000
+    # Token counts stored on parent chunks at ingest
+    TOKENIZER_BACKEND: str = "regex"  # "regex" or "tiktoken"
+    TOKENIZER_ENCODING: str = "cl100k_base"  # tiktoken only
+    TOKENIZER_WORKERS: int = 4  # tiktoken threads for large batches
+    TOKENIZER_PARALLEL_MIN_TEXTS: int = 256
+    TOKENIZER_CACHE_SIZE: int = 50000
+    # Local vector store for child chunk embeddings
+    VECTOR_STORE_DIR: str = "./vector_store"
+    VECTOR_ANN_THRESHOLD: int = 20000  # switch from brute force to IVF above this
+    VECTOR_IVF_LISTS: int = 1024
+    VECTOR_IVF_PROBE: int = 16
+    # Ingestion worker pool
+    INGEST_EXECUTOR: str = "process"  # "process" or "thread"
+    INGEST_MAX_WORKERS: int = 2
+    INGEST_MAX_PENDING_JOBS: int = 100
+    INGEST_JOB_HISTORY_SIZE: int = 1000
+    INGEST_PAGE_WINDOW: int = 16  # pages loaded and split per batch
+    INGEST_MAX_BUFFERED_BATCHES: int = 2
+    # Retrieval
+    RETRIEVAL_MODE: str = "hybrid"  # "vector", "lexical" or "hybrid"
+    RETRIEVAL_RRF_K: int = 60  # reciprocal rank fusion damping constant
+    LEXICAL_BACKEND: str = "postgres"  # "postgres" or "memory"
+    LEXICAL_INDEX_PATH: str = "./lexical_index.bin"  # memory backend; built by scripts.build_lexical_index
+    # Ranked results per normalized query, invalidated by ingestion
+    RETRIEVAL_CACHE_BACKEND: str = "memory"  # "memory", "redis" or "none"
+    RETRIEVAL_CACHE_SIZE: int = 10000
+    RETRIEVAL_CACHE_TTL: int = 600  # seconds
+    REDIS_URL: str = "redis://localhost:6379/0"
 
     class Config:
         env_file = ".env"
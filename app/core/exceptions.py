@@ -29,3 +29,9 @@ class ConflictException(HTTPException):
     """Raised when there's a conflict (e.g., duplicate resource)"""
     def __init__(self, detail: str = "Conflict"):
         super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+class PayloadTooLargeException(HTTPException):
+    """Raised when an uploaded payload exceeds the allowed size"""
+    def __init__(self, detail: str = "Payload too large"):
+        super().__init__(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
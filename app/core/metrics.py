@@ -0,0 +1,133 @@
+"""
+Lightweight timing instrumentation.
+
+`span` times a block or function, records it in a Prometheus histogram
+labelled by stage and, during an HTTP request, adds it to the request's
+Server-Timing header. When settings.METRICS_ENABLED is False a span is a
+single flag check.
+"""
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+from app.config import settings
+
+ENABLED = settings.METRICS_ENABLED
+
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STAGE_DURATION = Histogram(
+    "notebooklm_stage_duration_seconds",
+    "Time spent in an instrumented stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+STAGE_ERRORS = Counter(
+    "notebooklm_stage_errors_total",
+    "Instrumented stages that raised",
+    ["stage"]
+)
+REQUEST_DURATION = Histogram(
+    "notebooklm_http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+    buckets=STAGE_BUCKETS
+)
+INGESTED_CHUNKS = Counter(
+    "notebooklm_ingested_chunks_total",
+    "Chunks processed by ingestion jobs",
+    ["kind"]
+)
+INGESTION_JOBS = Counter(
+    "notebooklm_ingestion_jobs_total",
+    "Finished ingestion jobs",
+    ["status"]
+)
+RETRIEVAL_CACHE_REQUESTS = Counter(
+    "notebooklm_retrieval_cache_requests_total",
+    "Retrieval result cache lookups",
+    ["result"]
+)
+
+# Stage timings collected for the current request's Server-Timing header
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar(
+    "request_timings", default=None)
+
+
+def observe(stage: str, seconds: float) -> None:
+    """Record a duration measured elsewhere, e.g. in an ingestion worker."""
+    if not ENABLED:
+        return
+    STAGE_DURATION.labels(stage).observe(seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+class span:
+    """
+    Time a stage, as a context manager or a (sync or async) decorator.
+
+        with span("ingest.embed"):
+            ...
+
+        @span("db.bulk_create")
+        async def bulk_create(...): ...
+    """
+
+    __slots__ = ("stage", "_start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._start = 0.0
+
+    def __enter__(self) -> "span":
+        if ENABLED:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not ENABLED:
+            return
+        observe(self.stage, time.perf_counter() - self._start)
+        if exc_type is not None:
+            STAGE_ERRORS.labels(self.stage).inc()
+
+    def __call__(self, func: Callable) -> Callable:
+        stage = self.stage
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def start_request_timing() -> None:
+    """Begin collecting Server-Timing entries for the current context."""
+    _request_timings.set([])
+
+
+def stop_request_timing() -> None:
+    """Stop collecting, e.g. in background work spawned from a request."""
+    _request_timings.set(None)
+
+
+def server_timing_header(total_seconds: float) -> str:
+    """Render collected timings (summed per stage) as a Server-Timing value."""
+    totals: Dict[str, float] = {}
+    for stage, seconds in _request_timings.get() or []:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    entries = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in totals.items()]
+    entries.append(f"total;dur={total_seconds * 1000:.2f}")
+    return ", ".join(entries)
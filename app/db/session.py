@@ -1,13 +1,48 @@
+from typing import Any, Dict
+
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
-# Create async engine
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    """Pool and driver options shared by the primary and replica engines"""
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO, "future": True}
+    if url.startswith("sqlite"):
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if url.startswith("postgresql+asyncpg"):
+        # Cache prepared statements per connection so repeated queries skip
+        # the parse/plan round trip
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        }
+    return options
+
+
+# Create async engine (primary, used for writes)
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True
+    **_engine_options(settings.DATABASE_URL)
+)
+
+# Read-only engine for replica traffic; falls back to the primary when no
+# replica is configured. Transactions are opened READ ONLY either way so a
+# write through this engine fails loudly instead of hitting a replica.
+_read_url = settings.DATABASE_READ_URL or settings.DATABASE_URL
+read_engine = create_async_engine(
+    _read_url,
+    **_engine_options(_read_url)
 )
+if _read_url.startswith("postgresql"):
+    read_engine = read_engine.execution_options(postgresql_readonly=True)
 
 # Create async session factory
 SessionLocal = sessionmaker(
@@ -17,3 +52,12 @@ SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False
 )
+
+# Session factory for reads routed to the replica
+ReadSessionLocal = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
@@ -1,5 +1,5 @@
 from typing import Generator
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, ReadSessionLocal
 
 
 async def get_db() -> Generator:
@@ -17,3 +17,22 @@ async def get_db() -> Generator:
         yield db
     finally:
         await db.close()
+
+
+async def get_read_db() -> Generator:
+    """
+    Dependency function that yields read-only sessions routed to the
+    read replica (or the primary if DATABASE_READ_URL is unset).
+    Use this for read-only endpoints such as chunk retrieval and listing
+    (ParentChunkService.get_by_ids, get_all); writes must use get_db.
+    
+    Example:
+        @router.get("/chunks")
+        async def list_chunks(db: AsyncSession = Depends(get_read_db)):
+            return await ParentChunkService.get_all(db)
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
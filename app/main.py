@@ -1,7 +1,32 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.config import settings
+from app.core import metrics
 from app.api.v1.router import api_router
+from app.rag.ChunkingProfileRegistry import ChunkingProfileRegistry
+from app.rag.InvertedIndex import InvertedIndex
+from app.rag.VectorStore import VectorStore
+from app.rag.constants.enum import LexicalBackend
+from app.services.ingestion_service import ingestion_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop the background ingestion worker pool and vector store"""
+    ChunkingProfileRegistry.load()
+    VectorStore.get_default()
+    # Fail fast instead of serving retrieval without lexical hits
+    if LexicalBackend(settings.LEXICAL_BACKEND) == LexicalBackend.MEMORY:
+        InvertedIndex.get_default()
+    ingestion_service.start()
+    yield
+    await ingestion_service.shutdown()
+    VectorStore.get_default().save()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -9,7 +34,8 @@ app = FastAPI(
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -20,6 +46,27 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+
+
+if settings.METRICS_ENABLED:
+    @app.middleware("http")
+    async def timing_middleware(request: Request, call_next):
+        """Record request latency and expose stage timings via Server-Timing"""
+        metrics.start_request_timing()
+        start = time.perf_counter()
+        response = await call_next(request)
+        elapsed = time.perf_counter() - start
+
+        route = request.scope.get("route")
+        metrics.REQUEST_DURATION.labels(
+            request.method,
+            route.path if route is not None else "unmatched",
+            str(response.status_code)
+        ).observe(elapsed)
+        response.headers["Server-Timing"] = metrics.server_timing_header(elapsed)
+        return response
+
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -40,6 +87,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus metrics endpoint"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1,4 +1,5 @@
 # Database models
+from app.models.document import Document
 from app.models.parent_chunk import ParentChunk
 
-__all__ = ["ParentChunk"]
+__all__ = ["Document", "ParentChunk"]
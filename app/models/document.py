@@ -0,0 +1,50 @@
+from sqlalchemy import BigInteger, Column, Index, Integer, String, DateTime, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+from app.db.base import Base
+
+
+class Document(Base):
+    """
+    Model for an uploaded source document.
+    Every parent chunk produced from the upload references its document,
+    so a document's chunks can be deleted or replaced as one set.
+    """
+    __tablename__ = "documents"
+    __table_args__ = (
+        # One live document per file; failed ones may be uploaded again
+        Index("uq_documents_file_hash_active", "file_hash", unique=True,
+              postgresql_where=text("status <> 'failed'")),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # Source file
+    file_hash = Column(String(64), nullable=False, index=True,
+                       comment="SHA-256 hash of the uploaded file")
+    filename = Column(String(255), nullable=False,
+                      comment="Original filename provided by the user")
+    file_path = Column(String(1024), nullable=True,
+                       comment="Path where the uploaded file is stored")
+    file_size = Column(BigInteger, nullable=True,
+                       comment="Size of the uploaded file in bytes")
+    document_type = Column(String(16), nullable=True,
+                           comment="Document type, e.g. pdf, docx, txt")
+
+    # Ingestion state
+    status = Column(String(16), nullable=False, default="queued",
+                    comment="Ingestion status: queued, running, completed, failed")
+    parent_chunk_count = Column(Integer, nullable=False, default=0,
+                                comment="Number of parent chunks stored for this document")
+    child_chunk_count = Column(Integer, nullable=False, default=0,
+                               comment="Number of child chunks for this document")
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True),
+                        server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True),
+                        onupdate=func.now(), nullable=True)
+
+    def __repr__(self):
+        return f"<Document(id={self.id}, filename={self.filename}, status={self.status})>"
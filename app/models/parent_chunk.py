@@ -1,9 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import (
+    Column, Computed, ForeignKey, Index, Integer, LargeBinary, String, Text, DateTime, UniqueConstraint
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 import uuid
 from app.db.base import Base
 
+# Text search configuration of the generated search_vector column; queries
+# must use the same one to match
+SEARCH_CONFIG = "english"
+
 
 class ParentChunk(Base):
     """
@@ -12,17 +19,53 @@ class ParentChunk(Base):
     while embeddings are stored in a separate vector database.
     """
     __tablename__ = "parent_chunks"
+    __table_args__ = (
+        # Keyset pagination order
+        Index("idx_parent_chunks_chunk_index_id", "chunk_index", "id"),
+        # Per-document scans, deletes and replaces in chunk order
+        Index("idx_parent_chunks_document_id_chunk_index", "document_id", "chunk_index"),
+        # Chunks are deduplicated within a document; rows without a document
+        # still share one namespace
+        UniqueConstraint("document_id", "content_hash",
+                         name="uq_parent_chunks_document_id_content_hash",
+                         postgresql_nulls_not_distinct=True),
+        # Full-text search
+        Index("idx_parent_chunks_search_vector", "search_vector", postgresql_using="gin"),
+        # Near-duplicate clusters
+        Index("idx_parent_chunks_near_duplicate_of", "near_duplicate_of"),
+    )
 
     # Primary key - using UUID for better distribution and compatibility with vector DBs
     id = Column(UUID(as_uuid=True), primary_key=True,
                 default=uuid.uuid4, index=True)
 
+    # Source document; chunks are removed with it
+    document_id = Column(UUID(as_uuid=True),
+                         ForeignKey("documents.id", ondelete="CASCADE"), nullable=True,
+                         comment="Document this chunk was produced from")
+
     # Content fields
     content = Column(Text, nullable=False,
                      comment="The actual parent chunk text content")
-    content_hash = Column(String(64), nullable=False, index=True, unique=True,
+    content_hash = Column(String(64), nullable=False, index=True,
                           comment="SHA-256 hash of content for deduplication")
 
+    # Lexical search document, maintained by Postgres; deferred so ORM loads
+    # of chunks never fetch it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{SEARCH_CONFIG}', content)", persisted=True),
+        comment="Full-text search vector generated from content"))
+
+    # MinHash signature (MINHASH_NUM_PERM little-endian uint32 slots) for
+    # near-duplicate detection; deferred, it is only read to rebuild indexes
+    minhash = deferred(Column(LargeBinary, nullable=True,
+                              comment="MinHash signature of content"))
+    # Canonical chunk this one nearly duplicates. Not a foreign key: the
+    # canonical chunk may belong to another document and be deleted first
+    near_duplicate_of = Column(UUID(as_uuid=True), nullable=True,
+                               comment="ID of the canonical chunk this one nearly duplicates")
+
     # Ordering and metrics
     chunk_index = Column(Integer, nullable=False, index=True,
                          comment="Position/order of this chunk in sequence")
@@ -31,9 +74,10 @@ class ParentChunk(Base):
     char_count = Column(Integer, nullable=True,
                         comment="Character count of this chunk")
 
-    # Flexible metadata storage
-    metadata = Column(JSONB, nullable=True, default={},
-                      comment="Flexible metadata like page numbers, section headers, etc.")
+    # Flexible metadata storage ("metadata" is reserved on declarative
+    # models, so the attribute is renamed while the column keeps its name)
+    chunk_metadata = Column("metadata", JSONB, nullable=True, default={},
+                            comment="Flexible metadata like page numbers, section headers, etc.")
 
     # Timestamps
     created_at = Column(DateTime(timezone=True),
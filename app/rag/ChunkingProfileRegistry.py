@@ -0,0 +1,58 @@
+from typing import Dict, Optional
+
+from app.config import settings
+from app.rag.HierarchicalSplitter import HierarchicalSplitter
+from app.rag.constants.enum import DocumentType
+from app.rag.constants.types import ChunkingProfile
+
+DEFAULT_PROFILE: ChunkingProfile = {
+    "parent": {"chunk_size": 2000, "chunk_overlap": 200},
+    "child": {"chunk_size": 500, "chunk_overlap": 50},
+}
+
+
+class ChunkingProfileRegistry:
+    """
+    Parent/child chunk sizes per document type, and the
+    HierarchicalSplitter built from each.
+
+    Profiles default to DEFAULT_PROFILE and can be overridden per type via
+    settings.CHUNKING_PROFILES, e.g.
+    CHUNKING_PROFILES='{"pdf": {"parent": {"chunk_size": 3000, "chunk_overlap": 300}}}'.
+    The registry is built once per process.
+    """
+    _profiles: Optional[Dict[DocumentType, ChunkingProfile]] = None
+    _splitters: Dict[DocumentType, HierarchicalSplitter] = {}
+
+    @classmethod
+    def load(cls) -> Dict[DocumentType, ChunkingProfile]:
+        if cls._profiles is not None:
+            return cls._profiles
+
+        profiles: Dict[DocumentType, ChunkingProfile] = {}
+        for doc_type in DocumentType:
+            override = settings.CHUNKING_PROFILES.get(doc_type.value, {})
+            profiles[doc_type] = {
+                "parent": {**DEFAULT_PROFILE["parent"], **override.get("parent", {})},
+                "child": {**DEFAULT_PROFILE["child"], **override.get("child", {})},
+            }
+        cls._profiles = profiles
+        return profiles
+
+    @classmethod
+    def get_profile(cls, doc_type: DocumentType) -> ChunkingProfile:
+        return cls.load()[doc_type]
+
+    @classmethod
+    def get_splitter(cls, doc_type: DocumentType) -> HierarchicalSplitter:
+        splitter = cls._splitters.get(doc_type)
+        if splitter is None:
+            profile = cls.get_profile(doc_type)
+            splitter = HierarchicalSplitter(
+                parent_chunk_size=profile["parent"]["chunk_size"],
+                parent_chunk_overlap=profile["parent"]["chunk_overlap"],
+                child_chunk_size=profile["child"]["chunk_size"],
+                child_chunk_overlap=profile["child"]["chunk_overlap"]
+            )
+            cls._splitters[doc_type] = splitter
+        return splitter
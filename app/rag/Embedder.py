@@ -0,0 +1,123 @@
+import asyncio
+import re
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.utils.cache import LRUCache
+from app.utils.chunking import generate_content_hash
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class Embedder(ABC):
+    """
+    Base class for embedding backends.
+
+    Texts are deduplicated and looked up in an LRU cache keyed by their
+    SHA-256 content hash (the same hash used for parent chunk dedup), so
+    identical text is never embedded twice. Misses are split into
+    `batch_size` batches which run concurrently, at most `max_concurrency`
+    at a time. Backends only implement `_embed_batch`.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        batch_size: int = 64,
+        max_concurrency: int = 4,
+        cache_size: int = 50000
+    ):
+        self.dim = dim
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.cache: Optional[LRUCache[str, np.ndarray]] = (
+            LRUCache(max_size=cache_size) if cache_size > 0 else None
+        )
+
+    @abstractmethod
+    def _embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed one batch, returning a (len(texts), dim) float32 array"""
+
+    async def _aembed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed one batch without blocking the event loop.
+        Network backends should override this with a native async call."""
+        return await asyncio.to_thread(self._embed_batch, texts)
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts in cached, concurrent batches.
+
+        Returns:
+            (len(texts), dim) float32 array in input order
+        """
+        hashes = [generate_content_hash(text) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+        pending: Dict[str, str] = {}
+        for content_hash, text in zip(hashes, texts):
+            if content_hash in vectors or content_hash in pending:
+                continue
+            cached = self.cache.get(content_hash) if self.cache is not None else None
+            if cached is None:
+                pending[content_hash] = text
+            else:
+                vectors[content_hash] = cached
+
+        if pending:
+            pending_hashes = list(pending)
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def run(start: int) -> None:
+                batch_hashes = pending_hashes[start:start + self.batch_size]
+                async with semaphore:
+                    batch = await self._aembed_batch([pending[h] for h in batch_hashes])
+                for content_hash, vector in zip(batch_hashes, batch):
+                    vectors[content_hash] = vector
+                    if self.cache is not None:
+                        self.cache.set(content_hash, vector)
+
+            await asyncio.gather(*(
+                run(start) for start in range(0, len(pending_hashes), self.batch_size)
+            ))
+
+        if not hashes:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.stack([vectors[content_hash] for content_hash in hashes]).astype(np.float32)
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        """Embed a single query string"""
+        return (await self.embed([text]))[0]
+
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic, offline embedder based on signed feature hashing.
+
+    Lower-cased word unigrams and bigrams are hashed with CRC32 into `dim`
+    buckets with a hash-derived sign, term frequencies are log-scaled and
+    rows are L2-normalised. It needs no model or network access, so it is
+    suited to tests and throughput benchmarks rather than semantic quality.
+    """
+
+    def _embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        rows: List[int] = []
+        hashed: List[int] = []
+        for row, text in enumerate(texts):
+            tokens = _TOKEN_PATTERN.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            rows.extend([row] * len(features))
+            hashed.extend(zlib.crc32(feature.encode("utf-8")) for feature in features)
+
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if hashed:
+            hashes = np.asarray(hashed, dtype=np.uint32)
+            columns = (hashes % self.dim).astype(np.int64)
+            signs = np.where((hashes >> 31) & 1, -1.0, 1.0).astype(np.float32)
+            np.add.at(out, (np.asarray(rows, dtype=np.int64), columns), signs)
+
+        out = np.sign(out) * np.log1p(np.abs(out))
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
@@ -0,0 +1,34 @@
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.rag.Embedder import Embedder, HashingEmbedder
+from app.rag.constants.enum import EmbedderType
+
+
+class EmbedderFactory:
+    _embedders = {
+        EmbedderType.HASHING: HashingEmbedder,
+    }
+    _default: Optional[Embedder] = None
+
+    @classmethod
+    def get_embedder(cls, embedder_type: EmbedderType, config: Dict[str, Any] = {}) -> Embedder:
+        if embedder_type not in cls._embedders:
+            raise ValueError(f"Unknown embedder type: {embedder_type}")
+
+        return cls._embedders[embedder_type](**config)
+
+    @classmethod
+    def get_default(cls) -> Embedder:
+        """Process-wide embedder configured from settings, so its cache is shared"""
+        if cls._default is None:
+            cls._default = cls.get_embedder(
+                EmbedderType(settings.EMBEDDING_BACKEND),
+                {
+                    "dim": settings.EMBEDDING_DIM,
+                    "batch_size": settings.EMBEDDING_BATCH_SIZE,
+                    "max_concurrency": settings.EMBEDDING_MAX_CONCURRENCY,
+                    "cache_size": settings.EMBEDDING_CACHE_SIZE,
+                }
+            )
+        return cls._default
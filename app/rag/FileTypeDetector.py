@@ -0,0 +1,186 @@
+import codecs
+import struct
+from pathlib import Path
+from typing import List, Optional
+
+from app.rag.RagException import LoaderNotFoundException
+from app.rag.constants.enum import DocumentType
+
+# Bytes needed from the start of a file: magic bytes, the UTF-8 sample and
+# the first local ZIP headers
+HEAD_SIZE = 64 * 1024
+# Bytes needed from the end: the ZIP end of central directory record (22
+# bytes plus a comment of up to 64KB) and the central directory before it
+TAIL_SIZE = 256 * 1024
+# Bytes decoded to decide whether a file is UTF-8 text
+TEXT_SAMPLE_SIZE = 1024
+
+_EOCD = b"PK\x05\x06"
+_EOCD_SIZE = 22
+_EOCD64 = b"PK\x06\x06"
+_EOCD64_LOCATOR = b"PK\x06\x07"
+_CENTRAL_ENTRY = b"PK\x01\x02"
+_LOCAL_ENTRY = b"PK\x03\x04"
+
+# Main part of each OOXML package, as named in the ZIP directory
+_OOXML_MAIN_PARTS = {
+    b"word/document.xml": "docx",
+    b"xl/workbook.xml": "xlsx",
+    b"ppt/presentation.xml": "pptx",
+}
+
+
+class FileTypeDetector:
+    """
+    Detect the document type of a file from its first and last bytes.
+
+    PDF and legacy Word files are recognised by their magic bytes. ZIP
+    files are told apart by the entry names in their central directory,
+    read from the end of the file: only packages with a word/document.xml
+    part are DOCX, so spreadsheets, presentations, EPUBs and plain
+    archives are rejected here instead of failing inside the DOCX loader.
+    When the central directory does not fit in the tail, the local entry
+    headers at the start of the file are walked instead.
+
+    Works on buffers so the upload path can detect the type from bytes it
+    already held while streaming, without opening the stored file again.
+    """
+
+    @classmethod
+    def detect(cls, head: bytes, tail: bytes = b"", size: Optional[int] = None) -> DocumentType:
+        """
+        Detect the document type of a file.
+
+        Args:
+            head: The first bytes of the file, ideally HEAD_SIZE of them
+            tail: The last bytes of the file, ideally TAIL_SIZE of them
+            size: Total file size; defaults to len(head), i.e. head is
+                the whole file
+
+        Returns:
+            The detected DocumentType
+
+        Raises:
+            LoaderNotFoundException: If the type is not supported
+        """
+        if size is None:
+            size = len(head)
+        if not tail and size == len(head):
+            tail = head
+
+        # PDF: starts with %PDF
+        if head[:4] == b"%PDF":
+            return DocumentType.PDF
+
+        # DOC: starts with D0 CF 11 E0 (OLE2/CFB format - legacy Word format)
+        if head[:4] == b"\xD0\xCF\x11\xE0":
+            return DocumentType.DOC
+
+        # ZIP container: only OOXML word processing packages are supported
+        if head[:4] in (_LOCAL_ENTRY, _EOCD):
+            kind = cls._zip_kind(head, tail, size)
+            if kind == "docx":
+                return DocumentType.DOCX
+            raise LoaderNotFoundException(f"Unsupported file type: {kind}")
+
+        # TXT: check if content is valid UTF-8 text; the sample may end
+        # inside a multi-byte character, which the incremental decoder allows
+        try:
+            codecs.getincrementaldecoder("utf-8")().decode(head[:TEXT_SAMPLE_SIZE])
+        except UnicodeDecodeError:
+            raise LoaderNotFoundException("Unsupported file type: unknown binary format") from None
+        return DocumentType.TXT
+
+    @classmethod
+    def detect_file(cls, file_path: Path) -> DocumentType:
+        """Detect the type of a stored file, reading its head and tail in one open."""
+        with open(file_path, "rb") as file:
+            head = file.read(HEAD_SIZE)
+            size = file.seek(0, 2)
+            tail = b""
+            if size > len(head):
+                file.seek(max(size - TAIL_SIZE, 0))
+                tail = file.read()
+        return cls.detect(head, tail, size)
+
+    @classmethod
+    def _zip_kind(cls, head: bytes, tail: bytes, size: int) -> str:
+        """Short name of the ZIP based format, "zip" if not recognised"""
+        names = cls._central_directory_names(tail, size)
+        if names is None:
+            names = cls._local_entry_names(head)
+        for name in names:
+            kind = _OOXML_MAIN_PARTS.get(name)
+            if kind:
+                return kind
+
+        # EPUB and OpenDocument store their media type uncompressed as the
+        # first entry, named "mimetype"
+        if head[:4] == _LOCAL_ENTRY and head[30:38] == b"mimetype":
+            name_length, extra_length = struct.unpack_from("<HH", head, 26)
+            compressed_size = struct.unpack_from("<I", head, 18)[0]
+            start = 30 + name_length + extra_length
+            mimetype = head[start:start + min(compressed_size, 128)]
+            if mimetype == b"application/epub+zip":
+                return "epub"
+            if mimetype.startswith(b"application/vnd.oasis.opendocument."):
+                subtype = mimetype.rsplit(b".", 1)[-1].decode("ascii", "replace")
+                return f"opendocument-{subtype}"
+        return "zip"
+
+    @staticmethod
+    def _central_directory_names(tail: bytes, size: int) -> Optional[List[bytes]]:
+        """
+        Entry names from the central directory, or None if the end of
+        central directory record or the directory itself is not in `tail`.
+        """
+        # The record ends the file unless followed by a comment of <= 64KB
+        eocd = tail.rfind(_EOCD, max(len(tail) - _EOCD_SIZE - 0xFFFF, 0))
+        if eocd < 0 or eocd + _EOCD_SIZE > len(tail):
+            return None
+        entry_count, directory_size = struct.unpack_from("<HI", tail, eocd + 10)
+        directory_end = eocd
+
+        # ZIP64: the real counts live in a record pointed to by a locator
+        # just before the classic one
+        if entry_count == 0xFFFF or directory_size == 0xFFFFFFFF:
+            locator = eocd - 20
+            if locator < 0 or tail[locator:locator + 4] != _EOCD64_LOCATOR:
+                return None
+            eocd64 = struct.unpack_from("<Q", tail, locator + 8)[0] - (size - len(tail))
+            if eocd64 < 0 or tail[eocd64:eocd64 + 4] != _EOCD64:
+                return None
+            entry_count, directory_size = struct.unpack_from("<QQ", tail, eocd64 + 32)
+            directory_end = eocd64
+
+        # Locate the directory relative to its end rather than by its
+        # stored offset, which is wrong for archives with data prepended
+        position = directory_end - directory_size
+        if position < 0:
+            return None
+        names: List[bytes] = []
+        for _ in range(entry_count):
+            if tail[position:position + 4] != _CENTRAL_ENTRY or position + 46 > directory_end:
+                break
+            name_length, extra_length, comment_length = struct.unpack_from(
+                "<HHH", tail, position + 28)
+            names.append(tail[position + 46:position + 46 + name_length])
+            position += 46 + name_length + extra_length + comment_length
+        return names
+
+    @staticmethod
+    def _local_entry_names(head: bytes) -> List[bytes]:
+        """Entry names of the local headers that lie within `head`"""
+        names: List[bytes] = []
+        position = 0
+        while head[position:position + 4] == _LOCAL_ENTRY and position + 30 <= len(head):
+            flags, = struct.unpack_from("<H", head, position + 6)
+            compressed_size, = struct.unpack_from("<I", head, position + 18)
+            name_length, extra_length = struct.unpack_from("<HH", head, position + 26)
+            names.append(head[position + 30:position + 30 + name_length])
+            # Sizes of streamed entries follow their data, so the next
+            # header cannot be found
+            if flags & 0x08 and compressed_size == 0:
+                break
+            position += 30 + name_length + extra_length + compressed_size
+        return names
@@ -0,0 +1,149 @@
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+DEFAULT_SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+
+@dataclass(slots=True)
+class ChunkSpan:
+    """
+    A chunk described by character offsets into its source page.
+
+    `source` is the page text shared by every span of that page, so spans
+    never copy text until `text` is read. Offsets make highlighting cheap.
+    """
+    source: str
+    start: int
+    end: int
+    chunk_index: int
+    page_metadata: Dict[str, Any]
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    parent_id: str | None = None
+
+    @property
+    def text(self) -> str:
+        return self.source[self.start:self.end]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        metadata = {
+            **self.page_metadata,
+            "id": self.id,
+            "chunk_index": self.chunk_index,
+            "start_index": self.start,
+            "end_index": self.end,
+        }
+        if self.parent_id is not None:
+            metadata["parent_id"] = self.parent_id
+        return metadata
+
+
+class HierarchicalSplitter:
+    """
+    Produces parent chunks and their child chunks in a single pass.
+
+    Each page is cut into parent spans, preferring to break on the
+    separators in order (paragraph, line, sentence, word) within the last
+    half of the window. Children are cut the same way inside each parent's
+    span, so they reference the page text by offset instead of re-splitting
+    copied parent Documents.
+    """
+
+    def __init__(
+        self,
+        parent_chunk_size: int = 2000,
+        parent_chunk_overlap: int = 200,
+        child_chunk_size: int = 500,
+        child_chunk_overlap: int = 50,
+        separators: Sequence[str] = DEFAULT_SEPARATORS
+    ):
+        if parent_chunk_overlap >= parent_chunk_size or child_chunk_overlap >= child_chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.parent_chunk_size = parent_chunk_size
+        self.parent_chunk_overlap = parent_chunk_overlap
+        self.child_chunk_size = child_chunk_size
+        self.child_chunk_overlap = child_chunk_overlap
+        self.separators = tuple(separators)
+
+    def split_documents(
+        self,
+        documents: Iterable[Document],
+        start_index: int = 0
+    ) -> Tuple[List[ChunkSpan], List[ChunkSpan]]:
+        """
+        Split pages into parent and child spans.
+
+        Args:
+            documents: Pages as returned by a loader
+            start_index: chunk_index to assign to the first parent
+
+        Returns:
+            (parents, children); parent chunk_index runs across the whole
+            input, child chunk_index is the position within its parent
+        """
+        parents: List[ChunkSpan] = []
+        children: List[ChunkSpan] = []
+        chunk_index = start_index
+        for document in documents:
+            text = document.page_content
+            for p_start, p_end in self._spans(
+                text, 0, len(text), self.parent_chunk_size, self.parent_chunk_overlap
+            ):
+                parent = ChunkSpan(text, p_start, p_end, chunk_index, document.metadata)
+                parents.append(parent)
+                chunk_index += 1
+                for child_index, (c_start, c_end) in enumerate(self._spans(
+                    text, p_start, p_end, self.child_chunk_size, self.child_chunk_overlap
+                )):
+                    children.append(ChunkSpan(
+                        text, c_start, c_end, child_index, document.metadata,
+                        parent_id=parent.id
+                    ))
+        return parents, children
+
+    def _spans(
+        self,
+        text: str,
+        lo: int,
+        hi: int,
+        size: int,
+        overlap: int
+    ) -> List[Tuple[int, int]]:
+        spans: List[Tuple[int, int]] = []
+        pos = lo
+        while pos < hi:
+            while pos < hi and text[pos].isspace():
+                pos += 1
+            if pos >= hi:
+                break
+
+            limit = pos + size
+            if limit >= hi:
+                cut = hi
+            else:
+                cut = limit
+                floor = pos + size // 2
+                for separator in self.separators:
+                    found = text.rfind(separator, floor, limit)
+                    if found != -1:
+                        cut = found + len(separator)
+                        break
+
+            end = cut
+            while end > pos and text[end - 1].isspace():
+                end -= 1
+            spans.append((pos, end))
+            if cut >= hi:
+                break
+
+            next_pos = cut - overlap
+            if overlap and next_pos > pos:
+                # Start the overlap on a word boundary
+                space = text.find(" ", next_pos, cut)
+                if space != -1:
+                    next_pos = space + 1
+            pos = max(next_pos, pos + 1)
+        return spans
@@ -0,0 +1,363 @@
+import json
+import re
+import struct
+from collections import Counter
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.services.parent_chunk_service import ParentChunkService
+from app.utils.file_storage import atomic_write
+from .constants.types import IngestionResult
+
+# (parent chunk ID, BM25 score)
+LexicalHit = Tuple[UUID, float]
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; the same rule is used to index and to query."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    In-process BM25 index over parent chunk content, for lexical retrieval
+    without Postgres.
+
+    Postings are stored CSR-style in flat arrays: the postings of term t are
+    `posting_docs[term_offsets[t]:term_offsets[t + 1]]`, with integer doc
+    ids indexing into `doc_ids` (the ParentChunk UUIDs). The BM25 term
+    frequency / length normalisation is folded into `posting_weights` at
+    build time, so a query only multiplies by idf and accumulates.
+
+    Queries use MaxScore pruning: terms are scored from the highest
+    `max_impacts` (idf times the term's largest weight) down, and once the
+    current k-th best score exceeds what the remaining terms could still
+    add, those terms are only looked up for the surviving candidates. This
+    keeps common terms such as "the" from costing a pass over the corpus.
+
+    The index is immutable once built. It is persisted as a single binary
+    file and memory-mapped when loaded, so only the postings a query
+    touches are paged in. The app never writes it: build it from the
+    database with `python -m scripts.build_lexical_index` and rebuild it
+    after ingesting to make new documents searchable.
+    """
+
+    MAGIC = b"RAGIDX01"
+    # Array sections are aligned for memory mapping
+    _ALIGNMENT = 64
+    _default: Optional["InvertedIndex"] = None
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        term_offsets: np.ndarray,
+        posting_docs: np.ndarray,
+        posting_weights: np.ndarray,
+        idf: np.ndarray,
+        max_impacts: np.ndarray,
+        doc_ids: np.ndarray,
+        k1: float,
+        b: float
+    ):
+        self.vocabulary = vocabulary
+        self.term_offsets = term_offsets
+        self.posting_docs = posting_docs
+        self.posting_weights = posting_weights
+        self.idf = idf
+        # Upper bound of each term's contribution to any document's score
+        self.max_impacts = max_impacts
+        # (n_docs, 16) uint8 UUID bytes
+        self.doc_ids = doc_ids
+        self.k1 = k1
+        self.b = b
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    @classmethod
+    def get_default(cls) -> "InvertedIndex":
+        """
+        Process-wide index loaded from settings.LEXICAL_INDEX_PATH.
+
+        Raises:
+            FileNotFoundError: If the index has not been built; an empty
+                index would silently return no lexical hits
+        """
+        if cls._default is None:
+            path = Path(settings.LEXICAL_INDEX_PATH)
+            if not path.exists():
+                raise FileNotFoundError(
+                    f"Lexical index {path} not found; build it with "
+                    "`python -m scripts.build_lexical_index`"
+                )
+            cls._default = cls.load(path)
+        return cls._default
+
+    @classmethod
+    def build(
+        cls,
+        chunks: Iterable[Tuple[UUID, str]],
+        k1: float = 1.2,
+        b: float = 0.75
+    ) -> "InvertedIndex":
+        """
+        Build an index from (parent chunk ID, content) pairs.
+
+        Args:
+            chunks: Chunks to index; IDs must be unique
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalisation
+        """
+        vocabulary: Dict[str, int] = {}
+        doc_ids: List[bytes] = []
+        doc_lengths: List[int] = []
+        # Per-document postings, concatenated once at the end
+        terms_parts: List[np.ndarray] = []
+        tf_parts: List[np.ndarray] = []
+
+        for chunk_id, content in chunks:
+            counts = Counter(tokenize(content))
+            doc_ids.append(UUID(str(chunk_id)).bytes)
+            doc_lengths.append(sum(counts.values()))
+            terms_parts.append(np.fromiter(
+                (vocabulary.setdefault(term, len(vocabulary)) for term in counts),
+                dtype=np.int32, count=len(counts)))
+            tf_parts.append(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+
+        n_docs = len(doc_ids)
+        n_terms = len(vocabulary)
+        lengths = np.asarray(doc_lengths, dtype=np.float32)
+        terms = np.concatenate(terms_parts) if terms_parts else np.empty(0, dtype=np.int32)
+        tfs = np.concatenate(tf_parts) if tf_parts else np.empty(0, dtype=np.float32)
+        docs = np.repeat(
+            np.arange(n_docs, dtype=np.int32),
+            [len(part) for part in terms_parts]
+        ).astype(np.int32)
+
+        # Group postings by term; stable so each list stays in doc order
+        order = np.argsort(terms, kind="stable")
+        terms, docs, tfs = terms[order], docs[order], tfs[order]
+        doc_freq = np.bincount(terms, minlength=n_terms)
+        term_offsets = np.concatenate(([0], np.cumsum(doc_freq))).astype(np.int64)
+
+        avg_length = float(lengths.mean()) if n_docs else 0.0
+        norm = k1 * (1.0 - b + b * lengths[docs] / (avg_length or 1.0))
+        weights = (tfs * (k1 + 1.0) / (tfs + norm)).astype(np.float32)
+        idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        max_weights = (
+            np.maximum.reduceat(weights, term_offsets[:-1]) if n_terms
+            else np.empty(0, dtype=np.float32)
+        )
+
+        return cls(
+            vocabulary=vocabulary,
+            term_offsets=term_offsets,
+            posting_docs=docs,
+            posting_weights=weights,
+            idf=idf,
+            max_impacts=(idf * max_weights).astype(np.float32),
+            doc_ids=np.frombuffer(b"".join(doc_ids), dtype=np.uint8).reshape(n_docs, 16),
+            k1=k1,
+            b=b
+        )
+
+    @classmethod
+    def from_ingestion(cls, results: Iterable[IngestionResult], **kwargs) -> "InvertedIndex":
+        """Build an index from RagFacade.ingest / iter_ingest results."""
+        return cls.build(
+            (
+                (data["id"], data["content"])
+                for result in results
+                for data in result["parent_chunk_data"]
+            ),
+            **kwargs
+        )
+
+    @classmethod
+    async def from_database(cls, db: AsyncSession, **kwargs) -> "InvertedIndex":
+        """Build an index over every parent chunk stored in the database."""
+        chunks: List[Tuple[UUID, str]] = []
+        async for rows in ParentChunkService.stream_all(db):
+            chunks.extend((row.id, row.content) for row in rows)
+        return cls.build(chunks, **kwargs)
+
+    def search(self, query: str, top_k: int = 10) -> List[LexicalHit]:
+        """
+        Rank chunks against `query` with BM25.
+
+        Returns:
+            Up to top_k (chunk_id, score) tuples, best first
+        """
+        term_ids = {
+            self.vocabulary[term] for term in tokenize(query) if term in self.vocabulary
+        }
+        if not term_ids or top_k <= 0:
+            return []
+
+        n_docs = len(self)
+        terms = sorted(term_ids, key=lambda t: -self.max_impacts[t])
+        impacts = [float(self.max_impacts[t]) for t in terms]
+        # Scores are kept sparse (candidates + scores) while few documents
+        # match, dense (one slot per document) once postings are large
+        candidates: Optional[np.ndarray] = np.empty(0, dtype=np.int64)
+        scores = np.empty(0, dtype=np.float32)
+        dense: Optional[np.ndarray] = None
+        pruned = False
+
+        for i, t in enumerate(terms):
+            start, end = self.term_offsets[t], self.term_offsets[t + 1]
+            docs = self.posting_docs[start:end]
+            if dense is not None and len(docs) * 8 >= n_docs:
+                # Try to avoid a dense pass over a long postings list; any
+                # document can still gain at most sum(impacts[i:])
+                threshold = _kth_largest(dense, top_k)
+                remaining = sum(impacts[i:])
+                if threshold > remaining:
+                    candidates = np.flatnonzero(dense >= threshold - remaining)
+                    scores = dense[candidates]
+                    dense = None
+                    pruned = True
+
+            if pruned:
+                # Only documents still able to reach the top k are scored
+                positions = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+                hit = docs[positions] == candidates
+                scores[hit] += self.posting_weights[start + positions[hit]] * self.idf[t]
+                continue
+
+            contributions = self.posting_weights[start:end] * self.idf[t]
+            if i == 0:
+                # A single postings list has no repeated docs
+                candidates, scores = docs, contributions
+            elif dense is not None:
+                dense[docs] += contributions
+            elif (len(candidates) + len(docs)) * 8 >= n_docs:
+                dense = np.zeros(n_docs, dtype=np.float32)
+                dense[candidates] = scores
+                dense[docs] += contributions
+            else:
+                candidates, inverse = np.unique(
+                    np.concatenate((candidates, docs)), return_inverse=True)
+                scores = np.bincount(
+                    inverse, weights=np.concatenate((scores, contributions))
+                ).astype(np.float32)
+            if dense is None and i + 1 < len(terms):
+                # Unmatched documents can reach at most `remaining`
+                threshold = _kth_largest(scores, top_k)
+                remaining = sum(impacts[i + 1:])
+                if remaining < threshold:
+                    keep = scores >= threshold - remaining
+                    candidates, scores = candidates[keep], scores[keep]
+                    pruned = True
+
+        if dense is not None:
+            candidates, scores = None, dense
+
+        top = _top_k(scores, top_k)
+        # Dense scores include non-matching docs at zero
+        top = top[scores[top] > 0]
+        rows = top if candidates is None else candidates[top]
+        return [
+            (UUID(bytes=self.doc_ids[row].tobytes()), float(score))
+            for row, score in zip(rows, scores[top])
+        ]
+
+    def save(self, path: Path) -> None:
+        """Write the index to a single binary file, atomically."""
+        terms = sorted(self.vocabulary, key=self.vocabulary.__getitem__)
+        encoded = [term.encode("utf-8") for term in terms]
+        term_bytes = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        term_ends = np.cumsum([len(term) for term in encoded], dtype=np.int64)
+
+        arrays = {
+            "term_offsets": self.term_offsets,
+            "posting_docs": self.posting_docs,
+            "posting_weights": self.posting_weights,
+            "idf": self.idf,
+            "max_impacts": self.max_impacts,
+            "doc_ids": self.doc_ids,
+            "term_bytes": term_bytes,
+            "term_ends": term_ends,
+        }
+        # Lay sections out after a fixed-size header reservation
+        specs = {}
+        offset = 0
+        for name, array in arrays.items():
+            specs[name] = [offset, array.dtype.str, list(array.shape)]
+            offset = _align(offset + array.nbytes, self._ALIGNMENT)
+        header = json.dumps({
+            "k1": self.k1,
+            "b": self.b,
+            "arrays": specs,
+        }).encode("utf-8")
+        data_start = _align(len(self.MAGIC) + 8 + len(header), self._ALIGNMENT)
+
+        def write(f: BinaryIO) -> None:
+            f.write(self.MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + specs[name][0])
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.truncate(data_start + offset)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Rename so a concurrent load never observes a half-written index
+        atomic_write(path, write)
+
+    @classmethod
+    def load(cls, path: Path) -> "InvertedIndex":
+        """Memory-map an index written by save()."""
+        with open(path, "rb") as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"Not an inverted index file: {path}")
+            (header_length,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(header_length))
+        data_start = _align(len(cls.MAGIC) + 8 + header_length, cls._ALIGNMENT)
+
+        arrays = {}
+        for name, (offset, dtype, shape) in header["arrays"].items():
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(
+                    path, dtype=dtype, mode="r", offset=data_start + offset, shape=tuple(shape))
+
+        # The vocabulary is the one structure rebuilt in memory
+        blob = bytes(arrays.pop("term_bytes"))
+        ends = arrays.pop("term_ends").tolist()
+        starts = [0] + ends[:-1]
+        vocabulary = {
+            blob[start:end].decode("utf-8"): term_id
+            for term_id, (start, end) in enumerate(zip(starts, ends))
+        }
+        return cls(vocabulary=vocabulary, k1=header["k1"], b=header["b"], **arrays)
+
+
+def _kth_largest(values: np.ndarray, k: int) -> float:
+    """k-th largest value, or 0 if there are fewer than k values."""
+    if len(values) < k:
+        return 0.0
+    return float(np.partition(values, len(values) - k)[len(values) - k])
+
+
+def _top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k largest values, largest first."""
+    k = min(k, len(values))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    # A threshold plus a scan beats argpartition on long score arrays
+    top = np.flatnonzero(values >= _kth_largest(values, k))
+    top = top[np.argsort(-values[top], kind="stable")]
+    return top[:k]
+
+
+def _align(value: int, alignment: int) -> int:
+    return (value + alignment - 1) // alignment * alignment
@@ -0,0 +1,129 @@
+import re
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import settings
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Signature slot value of a text without tokens
+EMPTY_SLOT = np.uint32(0xFFFFFFFF)
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles, for estimating the Jaccard
+    similarity of chunk texts.
+
+    Texts are lower-cased into word tokens and every run of `shingle_size`
+    consecutive tokens is one shingle; texts shorter than that form a single
+    shingle. Token strings are hashed once per distinct token with CRC32;
+    everything after that is NumPy: shingle hashes are combined from the
+    token hashes of a whole batch at once, and each of the `num_perm`
+    permutations is a multiply-shift hash (high 32 bits of a 64-bit
+    product) whose minimum per text is taken with one `minimum.reduceat`.
+
+    The fraction of equal slots between two signatures estimates the
+    Jaccard similarity of their shingle sets. Signatures are only
+    comparable between hashers with the same num_perm, shingle_size and
+    seed.
+    """
+
+    # Upper bound on shingles x permutations materialised at once
+    _BLOCK_CELLS = 1 << 22
+    _default: Optional["MinHasher"] = None
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        if num_perm <= 0 or shingle_size <= 0:
+            raise ValueError("num_perm and shingle_size must be positive")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # Odd multipliers keep multiply-shift hashing universal
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self._mix = rng.integers(1, 2**63, size=shingle_size, dtype=np.uint64) | np.uint64(1)
+
+    @classmethod
+    def get_default(cls) -> "MinHasher":
+        """Process-wide hasher configured from settings"""
+        if cls._default is None:
+            cls._default = cls(
+                num_perm=settings.MINHASH_NUM_PERM,
+                shingle_size=settings.MINHASH_SHINGLE_SIZE
+            )
+        return cls._default
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Compute MinHash signatures.
+
+        Returns:
+            (len(texts), num_perm) uint32 array; rows of texts without any
+            word token are all EMPTY_SLOT
+        """
+        out = np.full((len(texts), self.num_perm), EMPTY_SLOT, dtype=np.uint32)
+        tokens: List[str] = []
+        lengths = np.zeros(len(texts), dtype=np.int64)
+        for row, text in enumerate(texts):
+            text_tokens = _TOKEN_PATTERN.findall(text.lower())
+            tokens.extend(text_tokens)
+            lengths[row] = len(text_tokens)
+        if not tokens:
+            return out
+
+        # Hash each distinct token once; map() keeps the per-token lookup in C
+        vocabulary: Dict[str, int] = {
+            token: code for code, token in enumerate(dict.fromkeys(tokens))}
+        codes = np.fromiter(map(vocabulary.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        token_hashes = np.fromiter(
+            (zlib.crc32(token.encode("utf-8")) for token in vocabulary),
+            dtype=np.uint64, count=len(vocabulary)
+        )[codes]
+        token_offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+        rows = np.flatnonzero(lengths)
+        k = self.shingle_size
+        # Short texts contribute one (shorter) shingle starting at their
+        # first token; positions past their end read as zero
+        counts = np.maximum(lengths[rows] - k + 1, 1)
+        shingle_offsets = np.concatenate(([0], np.cumsum(counts)))
+        owner = np.repeat(np.arange(len(rows)), counts)
+        starts = (
+            np.arange(shingle_offsets[-1])
+            - shingle_offsets[owner]
+            + token_offsets[rows][owner]
+        )
+        ends = token_offsets[rows + 1][owner]
+        padded = np.concatenate((token_hashes, np.zeros(k, dtype=np.uint64)))
+        shingles = np.zeros(len(starts), dtype=np.uint64)
+        for j in range(k):
+            position = starts + j
+            values = np.where(position < ends, padded[position], np.uint64(0))
+            shingles += values * self._mix[j]
+        shingles ^= shingles >> np.uint64(31)
+
+        # Blocks of whole texts, so each minimum stays within one block
+        per_block = max(1, self._BLOCK_CELLS // self.num_perm)
+        first = 0
+        while first < len(rows):
+            last = int(np.searchsorted(
+                shingle_offsets, shingle_offsets[first] + per_block, side="right")) - 1
+            last = min(max(last, first + 1), len(rows))
+            lo, hi = shingle_offsets[first], shingle_offsets[last]
+            # Permutations x shingles: reducing along contiguous rows is
+            # several times faster than along columns
+            hashed = self._a[:, None] * shingles[None, lo:hi]
+            hashed += self._b[:, None]
+            hashed >>= np.uint64(32)
+            out[rows[first:last]] = np.minimum.reduceat(
+                hashed, shingle_offsets[first:last] - lo, axis=1).T
+            first = last
+        return out
+
+
+def similarity(signature: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of one signature to each row of others"""
+    return (others == signature).mean(axis=-1)
@@ -0,0 +1,328 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.utils.file_storage import atomic_write
+from .MinHash import EMPTY_SLOT, similarity
+
+
+class NearDuplicateIndex:
+    """
+    LSH banding index over parent chunk MinHash signatures.
+
+    Each signature is cut into `bands` bands of `num_perm / bands` slots and
+    every band is hashed to one uint64 bucket key. Two chunks become
+    candidates when any band key matches, which happens with high
+    probability once their Jaccard similarity passes roughly
+    (1 / bands) ** (bands / num_perm); candidates are then confirmed by
+    comparing full signatures against `threshold`.
+
+    Bucket keys live in a sorted array searched with np.searchsorted for a
+    whole batch at once. Keys of entries added since the last rebuild sit
+    in a small dict and are merged in once they exceed 10% of the index,
+    the same amortisation VectorStore uses for its IVF lists.
+
+    Only canonical chunks are indexed: a chunk matched as a near-duplicate
+    is never added, so every match points at a canonical chunk. Ingestion
+    collects a job's canonical chunks in a private index and only `add`s
+    them to the shared one once the job has committed, so no job matches
+    a chunk that may still be rolled back. Removed chunks are tombstoned. Signatures are persisted as a .npy file and
+    memory-mapped when loaded; bucket keys are recomputed on load.
+    """
+
+    SIGNATURES_FILE = "signatures.npy"
+    IDS_FILE = "ids.json"
+    _default: Optional["NearDuplicateIndex"] = None
+
+    def __init__(
+        self,
+        num_perm: int,
+        directory: Optional[Path] = None,
+        bands: int = settings.NEAR_DUPLICATE_BANDS,
+        threshold: float = settings.NEAR_DUPLICATE_THRESHOLD
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.directory = directory
+        self.bands = bands
+        self.threshold = threshold
+        self._signatures: np.ndarray = np.empty((0, num_perm), dtype=np.uint32)
+        self._count = 0
+        self._ids: List[str] = []
+        # Sorted bucket keys of rows [0, _indexed_count) and their rows
+        self._keys: np.ndarray = np.empty(0, dtype=np.uint64)
+        self._key_rows: np.ndarray = np.empty(0, dtype=np.int64)
+        self._indexed_count = 0
+        # Bucket keys of rows added since the last rebuild
+        self._tail: Dict[int, List[int]] = {}
+        # Sorted row positions of removed entries
+        self._removed: np.ndarray = np.empty(0, dtype=np.int64)
+        rng = np.random.default_rng(num_perm)
+        self._band_mix = rng.integers(
+            1, 2**63, size=num_perm // bands, dtype=np.uint64) | np.uint64(1)
+        self._band_salt = rng.integers(0, 2**63, size=bands, dtype=np.uint64)
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count - len(self._removed)
+
+    @classmethod
+    def get_default(cls) -> "NearDuplicateIndex":
+        """Process-wide index persisted under settings.NEAR_DUPLICATE_INDEX_DIR"""
+        if cls._default is None:
+            cls._default = cls.load(
+                Path(settings.NEAR_DUPLICATE_INDEX_DIR),
+                num_perm=settings.MINHASH_NUM_PERM
+            )
+        return cls._default
+
+    @classmethod
+    def load(cls, directory: Path, num_perm: int, **kwargs) -> "NearDuplicateIndex":
+        """
+        Load a persisted index, memory-mapping the signature matrix.
+        Returns an empty index bound to `directory` if nothing is persisted.
+        """
+        index = cls(num_perm, directory=directory, **kwargs)
+        signatures_path = directory / cls.SIGNATURES_FILE
+        if not signatures_path.exists():
+            return index
+
+        signatures = np.load(signatures_path, mmap_mode="r")
+        if signatures.shape[1] != num_perm:
+            raise ValueError(
+                f"Persisted signatures have {signatures.shape[1]} slots, expected {num_perm}")
+        with open(directory / cls.IDS_FILE, "r") as f:
+            ids = json.load(f)
+        index._signatures = signatures
+        index._count = len(signatures)
+        index._ids = ids["ids"]
+        index._removed = np.asarray(ids.get("removed", []), dtype=np.int64)
+        index._rebuild()
+        return index
+
+    def save(self) -> None:
+        """Persist signatures and ids to `directory`."""
+        if self.directory is None:
+            raise ValueError("NearDuplicateIndex has no directory to save to")
+        # Saves are serialised so an older snapshot never replaces a newer one
+        with self._save_lock:
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                signatures = np.ascontiguousarray(self._signatures[:self._count])
+                ids = list(self._ids)
+                removed = self._removed.tolist()
+
+            # Write to temporary files and rename so a concurrent load never
+            # observes a half-written index
+            atomic_write(self.directory / self.SIGNATURES_FILE, lambda f: np.save(f, signatures))
+            atomic_write(
+                self.directory / self.IDS_FILE,
+                lambda f: f.write(json.dumps({"ids": ids, "removed": removed}).encode("utf-8"))
+            )
+
+    def match(
+        self,
+        signatures: np.ndarray,
+        exclude: Optional[Set[str]] = None
+    ) -> List[Optional[str]]:
+        """
+        Find a canonical near-duplicate for each signature without adding
+        anything.
+
+        Args:
+            signatures: (n, num_perm) uint32 MinHash signatures
+            exclude: Chunk IDs that must not be matched
+
+        Returns:
+            For each signature, the ID of the most similar canonical chunk
+            at or above the threshold, or None
+        """
+        signatures = np.asarray(signatures, dtype=np.uint32).reshape(-1, self.num_perm)
+        exclude = exclude or set()
+        matches: List[Optional[str]] = [None] * len(signatures)
+        with self._lock:
+            candidates = self._candidates(self._band_keys(signatures))
+            for i, rows in enumerate(candidates):
+                if not (signatures[i] == EMPTY_SLOT).all():
+                    matches[i] = self._best_match(signatures[i], rows, exclude)
+        return matches
+
+    def add(self, chunk_ids: Sequence[str], signatures: np.ndarray) -> None:
+        """Add chunks as canonical entries without matching them."""
+        signatures = np.asarray(signatures, dtype=np.uint32).reshape(-1, self.num_perm)
+        if len(signatures) != len(chunk_ids):
+            raise ValueError("Expected one signature per chunk ID")
+        with self._lock:
+            keys = self._band_keys(signatures)
+            for i, chunk_id in enumerate(chunk_ids):
+                self._append(str(chunk_id), signatures[i], keys[i])
+            self._maybe_rebuild()
+
+    def entries(self) -> Tuple[List[str], np.ndarray]:
+        """IDs and signatures of all live entries"""
+        with self._lock:
+            rows = np.setdiff1d(np.arange(self._count), self._removed)
+            return [self._ids[row] for row in rows.tolist()], np.array(self._signatures[rows])
+
+    def match_or_add(
+        self,
+        chunk_ids: Sequence[str],
+        signatures: np.ndarray,
+        exclude: Optional[Set[str]] = None
+    ) -> List[Optional[str]]:
+        """
+        Find a canonical near-duplicate for each chunk, adding the chunks
+        that have none as new canonical entries.
+
+        Chunks are handled in order, so a chunk can match one added earlier
+        in the same call. Chunks without any word token never match and
+        are not added.
+
+        Args:
+            chunk_ids: Parent chunk IDs
+            signatures: (len(chunk_ids), num_perm) uint32 MinHash signatures
+            exclude: Chunk IDs that must not be matched, e.g. the previous
+                version of the document being re-ingested
+
+        Returns:
+            For each chunk, the ID of the most similar canonical chunk at or
+            above the threshold, or None if the chunk was added
+        """
+        signatures = np.asarray(signatures, dtype=np.uint32).reshape(-1, self.num_perm)
+        if len(signatures) != len(chunk_ids):
+            raise ValueError("Expected one signature per chunk ID")
+        exclude = exclude or set()
+        matches: List[Optional[str]] = [None] * len(chunk_ids)
+
+        with self._lock:
+            keys = self._band_keys(signatures)
+            first_new_row = self._count
+            existing = self._candidates(keys)
+            for i, chunk_id in enumerate(chunk_ids):
+                if (signatures[i] == EMPTY_SLOT).all():
+                    continue
+                rows = existing[i]
+                # Rows added earlier in this call are only in the tail
+                added = {
+                    row for key in keys[i].tolist()
+                    for row in self._tail.get(key, ())
+                    if row >= first_new_row
+                }
+                if added:
+                    rows = np.union1d(rows, np.fromiter(added, dtype=np.int64))
+                match = self._best_match(signatures[i], rows, exclude)
+                if match is None:
+                    self._append(str(chunk_id), signatures[i], keys[i])
+                else:
+                    matches[i] = match
+
+            self._maybe_rebuild()
+        return matches
+
+    def remove(self, chunk_ids: Iterable[str]) -> int:
+        """
+        Tombstone the entries of the given chunks so they are no longer
+        matched.
+
+        Returns:
+            Number of entries removed
+        """
+        targets = {str(chunk_id) for chunk_id in chunk_ids}
+        if not targets:
+            return 0
+        with self._lock:
+            rows = np.fromiter(
+                (row for row, chunk_id in enumerate(self._ids) if chunk_id in targets),
+                dtype=np.int64
+            )
+            before = len(self._removed)
+            self._removed = np.union1d(self._removed, rows)
+            return len(self._removed) - before
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """(n, bands) uint64 bucket keys; equal bands give equal keys"""
+        bands = signatures.reshape(len(signatures), self.bands, -1).astype(np.uint64)
+        keys = (bands * self._band_mix).sum(axis=2, dtype=np.uint64)
+        keys ^= keys >> np.uint64(29)
+        return keys + self._band_salt
+
+    def _candidates(self, keys: np.ndarray) -> List[np.ndarray]:
+        """Rows sharing at least one bucket key, per row of keys"""
+        flat = keys.ravel()
+        left = np.searchsorted(self._keys, flat, side="left")
+        right = np.searchsorted(self._keys, flat, side="right")
+        counts = right - left
+        # Concatenated [left, right) ranges, tagged with their query
+        starts = np.repeat(left - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+        rows = self._key_rows[np.arange(counts.sum()) + starts]
+        queries = np.repeat(np.arange(len(flat)) // self.bands, counts)
+
+        candidates = []
+        bounds = np.searchsorted(queries, np.arange(len(keys) + 1))
+        for i in range(len(keys)):
+            found = rows[bounds[i]:bounds[i + 1]]
+            tail = [row for key in keys[i].tolist() for row in self._tail.get(key, ())]
+            if tail:
+                found = np.concatenate((found, np.asarray(tail, dtype=np.int64)))
+            candidates.append(np.unique(found))
+        return candidates
+
+    def _best_match(
+        self,
+        signature: np.ndarray,
+        rows: np.ndarray,
+        exclude: Set[str]
+    ) -> Optional[str]:
+        if len(self._removed):
+            rows = rows[~np.isin(rows, self._removed)]
+        if exclude:
+            rows = rows[[self._ids[row] not in exclude for row in rows.tolist()]]
+        if not len(rows):
+            return None
+        scores = similarity(signature, self._signatures[rows])
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return self._ids[rows[best]]
+
+    def _append(self, chunk_id: str, signature: np.ndarray, keys: np.ndarray) -> None:
+        self._reserve(self._count + 1)
+        self._signatures[self._count] = signature
+        self._ids.append(chunk_id)
+        for key in keys.tolist():
+            self._tail.setdefault(key, []).append(self._count)
+        self._count += 1
+
+    def _maybe_rebuild(self) -> None:
+        if self._count - self._indexed_count > max(1024, self._indexed_count // 10):
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Merge every live entry's bucket keys into the sorted arrays."""
+        keys = self._band_keys(np.asarray(self._signatures[:self._count])).ravel()
+        rows = np.arange(len(keys)) // self.bands
+        if len(self._removed):
+            live = ~np.isin(rows, self._removed)
+            keys, rows = keys[live], rows[live]
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._key_rows = rows[order]
+        self._indexed_count = self._count
+        self._tail = {}
+
+    def _reserve(self, capacity: int) -> None:
+        # Memory-mapped arrays are read-only; copy into a writable buffer
+        # on first growth, doubling capacity to keep appends amortised O(1)
+        if len(self._signatures) >= capacity and self._signatures.flags.writeable:
+            return
+        new_capacity = max(capacity, 2 * len(self._signatures), 1024)
+        buffer = np.empty((new_capacity, self.num_perm), dtype=np.uint32)
+        if self._count:
+            buffer[:self._count] = self._signatures[:self._count]
+        self._signatures = buffer
@@ -0,0 +1,100 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from langchain_community.document_loaders import PyPDFLoader
+from langchain_community.document_loaders.base import BaseLoader
+from langchain_core.documents import Document
+from pypdf import PdfReader
+
+from app.config import settings
+
+
+class ParallelPdfLoader(BaseLoader):
+    """
+    PDF loader that extracts text from page shards in a process pool.
+
+    Documents with fewer than `min_pages` pages are loaded serially with
+    PyPDFLoader so small files don't pay process startup costs. Larger ones
+    are split into `pages_per_shard` page ranges extracted concurrently;
+    shards are yielded in page order as they complete, one Document per
+    page with the same metadata keys PyPDFLoader produces.
+
+    Shards are submitted lazily with at most `max_workers` in flight, so
+    extracted pages buffered ahead of the consumer stay bounded and the
+    ingest page window still bounds memory. The pool is shared by every
+    loader in the process rather than started per document.
+    """
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    def __init__(
+        self,
+        file_path: Path,
+        max_workers: int = settings.PDF_PARALLEL_WORKERS,
+        min_pages: int = settings.PDF_PARALLEL_MIN_PAGES,
+        pages_per_shard: int = settings.PDF_PAGES_PER_SHARD
+    ):
+        self.file_path = file_path
+        # More workers than cores only adds process overhead
+        self.max_workers = min(max_workers, os.cpu_count() or 1)
+        self.min_pages = min_pages
+        self.pages_per_shard = pages_per_shard
+
+    def lazy_load(self) -> Iterator[Document]:
+        total_pages = len(PdfReader(self.file_path).pages)
+        if self.max_workers <= 1 or total_pages < self.min_pages:
+            yield from PyPDFLoader(str(self.file_path)).lazy_load()
+            return
+
+        executor = self._get_executor(self.max_workers)
+        starts = iter(range(0, total_pages, self.pages_per_shard))
+        in_flight: Deque[Future] = deque()
+        try:
+            while True:
+                while len(in_flight) < self.max_workers:
+                    start = next(starts, None)
+                    if start is None:
+                        break
+                    end = min(start + self.pages_per_shard, total_pages)
+                    in_flight.append(
+                        executor.submit(_extract_pages, str(self.file_path), start, end))
+                if not in_flight:
+                    break
+                yield from in_flight.popleft().result()
+        finally:
+            # The consumer stopped early; drop shards that have not started
+            for future in in_flight:
+                future.cancel()
+
+    @classmethod
+    def _get_executor(cls, max_workers: int) -> ProcessPoolExecutor:
+        """Process-wide extraction pool, started on first use"""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ProcessPoolExecutor(max_workers=max_workers)
+            return cls._executor
+
+
+def _extract_pages(file_path: str, start: int, end: int) -> List[Document]:
+    """Extract pages [start, end) of a PDF; runs in a worker process."""
+    reader = PdfReader(file_path)
+    doc_metadata: Dict[str, Any] = {"producer": "PyPDF", "creator": "PyPDF", "creationdate": ""}
+    for key, value in (reader.metadata or {}).items():
+        doc_metadata[key.lstrip("/").lower()] = str(value)
+    doc_metadata["source"] = file_path
+    doc_metadata["total_pages"] = len(reader.pages)
+    # page_labels rebuilds the labels of every page on each access
+    labels = reader.page_labels
+
+    return [
+        Document(
+            page_content=reader.pages[page].extract_text().strip(),
+            metadata={**doc_metadata, "page": page, "page_label": labels[page]}
+        )
+        for page in range(start, end)
+    ]
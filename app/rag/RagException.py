@@ -2,3 +2,9 @@ class LoaderNotFoundException(Exception):
     def __init__(self, message: str = "Loader not found for the given document type"):
         self.message = message
         super().__init__(self.message)
+
+
+class IngestionQueueFullException(Exception):
+    def __init__(self, message: str = "Ingestion queue is full, try again later"):
+        self.message = message
+        super().__init__(self.message)
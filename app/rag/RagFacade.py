@@ -1,43 +1,258 @@
-import uuid
+import asyncio
+import time
+from itertools import islice
+from pathlib import Path
+from queue import Queue
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
 
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from pathlib import Path
 from .LoaderFactory import LoaderFactory
-from .SplitterFactory import SplitterFactory
-from .constants.enum import SplitterType
+from .ChunkingProfileRegistry import ChunkingProfileRegistry
+from .EmbedderFactory import EmbedderFactory
+from .InvertedIndex import InvertedIndex
+from .MinHash import MinHasher
+from .RetrievalCache import RetrievalCache
+from .TokenizerFactory import TokenizerFactory
+from .VectorStore import VectorStore
+from .constants.enum import DocumentType, LexicalBackend, RetrievalMode
+from .constants.types import IngestionResult
+from app.config import settings
+from app.core import metrics
+from app.core.metrics import span
+from app.schemas.parent_chunk import ParentChunkResponse
+from app.services.parent_chunk_service import ParentChunkService
+from app.utils.chunking import prepare_parent_chunk_data
+from app.utils.packing import pack_to_budget
+from app.utils.ranking import reciprocal_rank_fusion
+
+# Several children usually hit the same parent, so over-fetch child
+# results to still fill top_k distinct parents
+CHILD_HITS_PER_PARENT = 4
+# Prompt tokens each packed parent costs beyond its content (separators,
+# source header)
+CONTEXT_OVERHEAD_TOKENS = 8
 
 
 class RagFacade:
 
     @staticmethod
-    def ingest(file_path: Path):
-        loader = LoaderFactory.get_loader(file_path)
-        documents = loader.load()
-
-        parent_splitter = SplitterFactory.get_splitter(
-            SplitterType.RECURSIVE_CHARACTER,
-            {"chunk_size": 2000, "chunk_overlap": 200}
-        )
-        child_splitter = SplitterFactory.get_splitter(
-            SplitterType.RECURSIVE_CHARACTER,
-            {"chunk_size": 500, "chunk_overlap": 50}
-        )
-
-        parent_chunks = parent_splitter.split_documents(documents)
-
-        child_chunks = []
-        for parent_chunk in parent_chunks:
-            parent_id = str(uuid.uuid4())
-            parent_chunk.metadata["id"] = parent_id
-
-            children = child_splitter.split_documents([parent_chunk])
-            for child in children:
-                child.metadata["parent_id"] = parent_id
-
-            child_chunks.extend(children)
-        print(parent_chunks)
-        print(child_chunks)
+    def iter_ingest(
+        file_path: Path,
+        page_window: int = settings.INGEST_PAGE_WINDOW,
+        doc_type: Optional[DocumentType] = None
+    ) -> Iterator[IngestionResult]:
+        """
+        Stream a document through loading and splitting.
+
+        Pages come from the loader's lazy_load() and are split `page_window`
+        pages at a time, so peak memory follows the window rather than the
+        document size. chunk_index runs continuously across batches.
+        Parent token counts are computed here, once per process-wide
+        tokenizer, so retrieval never has to tokenize parents, as are the
+        parents' MinHash signatures for near-duplicate detection.
+
+        Each batch carries the seconds spent per stage in "timings", since
+        this usually runs in a worker process whose metrics would be lost.
+        `doc_type` is the type detected at upload; the file is only sniffed
+        when it is not given.
+        """
+        start = time.perf_counter()
+        if doc_type is None:
+            doc_type = LoaderFactory.get_document_type(file_path)
+        loader = LoaderFactory.get_loader(file_path, doc_type)
+        splitter = ChunkingProfileRegistry.get_splitter(doc_type)
+        tokenizer = TokenizerFactory.get_default()
+        hasher = MinHasher.get_default()
+        setup_seconds = time.perf_counter() - start
+
+        chunk_index = 0
+        pages = loader.lazy_load()
+        while True:
+            start = time.perf_counter()
+            window = list(islice(pages, page_window))
+            if not window:
+                break
+            loaded = time.perf_counter()
+            parent_chunks, child_chunks = splitter.split_documents(window, chunk_index)
+            chunk_index += len(parent_chunks)
+            split = time.perf_counter()
+            texts = [parent.text for parent in parent_chunks]
+            token_counts = tokenizer.count(texts)
+            tokenized = time.perf_counter()
+            signatures = hasher.signatures(texts)
+            signed = time.perf_counter()
+            parent_chunk_data = [
+                {
+                    "id": parent.id,
+                    **prepare_parent_chunk_data(
+                        parent.text,
+                        parent.chunk_index,
+                        token_count=token_count,
+                        metadata=parent.metadata
+                    ),
+                    "minhash": signature.tobytes()
+                }
+                for parent, token_count, signature in zip(parent_chunks, token_counts, signatures)
+            ]
+            timings = {
+                "ingest.load": loaded - start + setup_seconds,
+                "ingest.split": split - loaded,
+                "ingest.tokenize": tokenized - split,
+                "ingest.minhash": signed - tokenized,
+                "ingest.hash": time.perf_counter() - signed,
+            }
+            setup_seconds = 0.0
+            yield {
+                "child_chunks": child_chunks,
+                "parent_chunk_data": parent_chunk_data,
+                "timings": timings
+            }
+
+    @staticmethod
+    def ingest(file_path: Path) -> IngestionResult:
+        """Load and split a whole document into a single result."""
+        result: IngestionResult = {"child_chunks": [], "parent_chunk_data": [], "timings": {}}
+        for batch in RagFacade.iter_ingest(file_path):
+            result["child_chunks"].extend(batch["child_chunks"])
+            result["parent_chunk_data"].extend(batch["parent_chunk_data"])
+            for stage, seconds in batch["timings"].items():
+                result["timings"][stage] = result["timings"].get(stage, 0.0) + seconds
+        return result
+
+    @staticmethod
+    def ingest_to_queue(
+        file_path: Path,
+        queue: Queue,
+        doc_type: Optional[DocumentType] = None
+    ) -> None:
+        """
+        Worker-pool producer for iter_ingest.
+
+        Puts each batch on `queue`, blocking while the consumer is behind so
+        the queue's maxsize bounds buffered batches, and always finishes
+        with None. Exceptions propagate through the executor future.
+        """
+        try:
+            for batch in RagFacade.iter_ingest(file_path, doc_type=doc_type):
+                queue.put(batch)
+        finally:
+            queue.put(None)
+
+    @staticmethod
+    async def retrieve(
+        db: AsyncSession,
+        query: str,
+        top_k: int = 5,
+        mode: Optional[RetrievalMode] = None
+    ) -> List[ParentChunkResponse]:
+        """
+        Find the parent chunks that best match the query.
+
+        VECTOR ranks parents by their children's embedding similarity,
+        LEXICAL by full-text search over parent content (Postgres, or the
+        in-process InvertedIndex per settings.LEXICAL_BACKEND), and
+        HYBRID runs both concurrently and merges them with reciprocal rank
+        fusion. Defaults to settings.RETRIEVAL_MODE.
+
+        Ranked parent IDs are cached per normalized query and corpus
+        version (see RetrievalCache), and parents are hydrated through
+        ParentChunkService.hydrate, so a repeated query touches neither the
+        embedder, the indexes nor, for hot parents, the database.
+
+        Near-duplicate parents (see NEAR_DUPLICATE_POLICY) are collapsed to
+        the best-ranked member of their cluster before truncating to top_k,
+        so clusters do not shrink the result; the cache holds the collapsed
+        IDs.
+
+        Returns:
+            Up to top_k distinct parent chunks, best match first
+        """
+        mode = mode or RetrievalMode(settings.RETRIEVAL_MODE)
+        cache = RetrievalCache.get_default()
+        if cache is not None:
+            cache_key = await cache.key(query, mode, top_k)
+            parent_ids = await cache.get(cache_key)
+            if parent_ids is not None:
+                metrics.RETRIEVAL_CACHE_REQUESTS.labels("hit").inc()
+                return await ParentChunkService.hydrate(db, parent_ids)
+            metrics.RETRIEVAL_CACHE_REQUESTS.labels("miss").inc()
+
+        candidates = top_k * CHILD_HITS_PER_PARENT
+
+        searches = []
+        if mode in (RetrievalMode.VECTOR, RetrievalMode.HYBRID):
+            searches.append(RagFacade._vector_ranking(query, candidates))
+        if mode in (RetrievalMode.LEXICAL, RetrievalMode.HYBRID):
+            searches.append(RagFacade._lexical_ranking(db, query, candidates))
+        rankings = await asyncio.gather(*searches)
+
+        # Hydrate the whole fused list: clusters are only known once parents
+        # are loaded, and collapsing them must not leave fewer than top_k
+        fused = reciprocal_rank_fusion(rankings, settings.RETRIEVAL_RRF_K)
+        parents = []
+        if fused:
+            parents = _collapse_near_duplicates(
+                await ParentChunkService.hydrate(db, fused))[:top_k]
+        if cache is not None:
+            await cache.set(cache_key, [parent.id for parent in parents])
+        return parents
+
+    @staticmethod
+    def pack_context(
+        parents: List[ParentChunkResponse],
+        token_budget: Optional[int]
+    ) -> Tuple[List[ParentChunkResponse], int]:
+        """
+        Select best-first parents that fit a prompt token budget, using the
+        token counts stored at ingest. Only parents ingested before counts
+        were stored are tokenized.
+
+        Args:
+            parents: Retrieved parents, best match first
+            token_budget: Prompt tokens available for context, or None to
+                keep every parent and only count them
+
+        Returns:
+            Tuple of (the parents that fit in rank order, prompt tokens they
+            use including CONTEXT_OVERHEAD_TOKENS per parent)
+        """
+        missing = [parent.content for parent in parents if parent.token_count is None]
+        counted = iter(TokenizerFactory.get_default().count(missing) if missing else [])
+        costs = [
+            parent.token_count if parent.token_count is not None else next(counted)
+            for parent in parents
+        ]
+        return pack_to_budget(parents, costs, token_budget, CONTEXT_OVERHEAD_TOKENS)
 
     @staticmethod
-    def retrieve():
-        pass
+    async def _vector_ranking(query: str, limit: int) -> List[UUID]:
+        """Distinct parent IDs of the children nearest the query, best first."""
+        with span("retrieve.embed"):
+            query_embedding = await EmbedderFactory.get_default().embed_query(query)
+        with span("retrieve.search"):
+            hits = VectorStore.get_default().search(query_embedding, limit)
+        return list(dict.fromkeys(UUID(parent_id) for _, parent_id, _ in hits))
+
+    @staticmethod
+    async def _lexical_ranking(db: AsyncSession, query: str, limit: int) -> List[UUID]:
+        """Parent IDs matching the query text, best first."""
+        with span("retrieve.lexical"):
+            if LexicalBackend(settings.LEXICAL_BACKEND) == LexicalBackend.MEMORY:
+                hits = InvertedIndex.get_default().search(query, limit)
+            else:
+                hits = await ParentChunkService.search(db, query, limit)
+            return [chunk_id for chunk_id, _ in hits]
+
+
+def _collapse_near_duplicates(parents: List[ParentChunkResponse]) -> List[ParentChunkResponse]:
+    """Keep the first (best-ranked) parent of each near-duplicate cluster."""
+    seen = set()
+    kept = []
+    for parent in parents:
+        cluster = parent.near_duplicate_of or parent.id
+        if cluster not in seen:
+            seen.add(cluster)
+            kept.append(parent)
+    return kept
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import unicodedata
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional
+from uuid import UUID
+
+from app.config import settings
+from app.utils.cache import LRUCache
+from .constants.enum import RetrievalCacheType, RetrievalMode
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a query for cache keys: NFKC, lower-cased, runs of
+    whitespace collapsed. Both retrievers ignore case and spacing, so
+    queries differing only in those share an entry.
+    """
+    return " ".join(unicodedata.normalize("NFKC", query).lower().split())
+
+
+class RetrievalCache(ABC):
+    """
+    Cache of ranked parent chunk IDs per retrieval query.
+
+    Keys combine the corpus version with the normalized query and the
+    retrieval parameters. Ingestion bumps the version, which makes every
+    earlier entry unreachable without deleting anything; old entries age
+    out of the LRU or expire by TTL. Only IDs are cached: parents are
+    hydrated through ParentChunkService.hydrate, whose cache already
+    tracks chunk updates and deletes.
+
+    Backends implement the version counter, get and set.
+    """
+
+    _default: Optional["RetrievalCache"] = None
+    _disabled = False
+
+    @abstractmethod
+    async def get_version(self) -> int:
+        """Current corpus version"""
+
+    @abstractmethod
+    async def bump_version(self) -> int:
+        """Invalidate all entries by moving to a new corpus version"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[List[UUID]]:
+        """Ranked parent IDs stored under key, or None on a miss"""
+
+    @abstractmethod
+    async def set(self, key: str, parent_ids: List[UUID]) -> None:
+        """Store ranked parent IDs under key"""
+
+    async def key(self, query: str, mode: RetrievalMode, top_k: int) -> str:
+        """
+        Cache key for a query at the current corpus version. Take it before
+        running the search: if ingestion completes meanwhile, the result is
+        stored under the old version and never served.
+        """
+        version = await self.get_version()
+        digest = hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+        return f"{version}:{mode.value}:{top_k}:{digest}"
+
+    @classmethod
+    def get_default(cls) -> Optional["RetrievalCache"]:
+        """Process-wide cache configured from settings, None if disabled"""
+        if cls._default is None and not cls._disabled:
+            cache_type = RetrievalCacheType(settings.RETRIEVAL_CACHE_BACKEND)
+            if cache_type == RetrievalCacheType.MEMORY:
+                cls._default = LRURetrievalCache(
+                    max_size=settings.RETRIEVAL_CACHE_SIZE,
+                    ttl=settings.RETRIEVAL_CACHE_TTL
+                )
+            elif cache_type == RetrievalCacheType.REDIS:
+                # Only needed for this backend
+                from redis import asyncio as redis
+
+                cls._default = RedisRetrievalCache(
+                    redis.from_url(settings.REDIS_URL),
+                    ttl=settings.RETRIEVAL_CACHE_TTL
+                )
+            else:
+                cls._disabled = True
+        return cls._default
+
+    @classmethod
+    async def invalidate_default(cls) -> None:
+        """
+        Bump the corpus version of the default cache after the corpus
+        changed. Best effort: if the backend is unreachable, entries still
+        expire after RETRIEVAL_CACHE_TTL, and the change that triggered
+        this must not fail because of the cache.
+        """
+        try:
+            cache = cls.get_default()
+            if cache is not None:
+                await cache.bump_version()
+        except Exception:
+            pass
+
+
+class LRURetrievalCache(RetrievalCache):
+    """In-process backend; the corpus version is local to this process."""
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        self.entries: LRUCache[str, List[UUID]] = LRUCache(max_size=max_size, ttl=ttl)
+        self.version = 0
+
+    async def get_version(self) -> int:
+        return self.version
+
+    async def bump_version(self) -> int:
+        self.version += 1
+        # Entries of older versions can never be hit again
+        self.entries.clear()
+        return self.version
+
+    async def get(self, key: str) -> Optional[List[UUID]]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, parent_ids: List[UUID]) -> None:
+        self.entries.set(key, parent_ids)
+
+
+class RedisRetrievalCache(RetrievalCache):
+    """
+    Backend shared by all processes through Redis. The corpus version is a
+    counter key, so ingestion in any worker invalidates every worker.
+
+    Args:
+        client: Async Redis client; only get, set(ex=) and incr are used,
+            so redis.asyncio.Redis and fakes such as fakeredis both work
+        ttl: Seconds an entry is kept, or None to rely on Redis eviction
+        prefix: Namespace for the keys written by this cache
+    """
+
+    def __init__(self, client: Any, ttl: Optional[int] = None, prefix: str = "retrieval:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get_version(self) -> int:
+        version = await self.client.get(self.prefix + "version")
+        return int(version) if version is not None else 0
+
+    async def bump_version(self) -> int:
+        return int(await self.client.incr(self.prefix + "version"))
+
+    async def get(self, key: str) -> Optional[List[UUID]]:
+        value = await self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        return [UUID(parent_id) for parent_id in json.loads(value)]
+
+    async def set(self, key: str, parent_ids: List[UUID]) -> None:
+        await self.client.set(
+            self.prefix + key,
+            json.dumps([str(parent_id) for parent_id in parent_ids]),
+            ex=self.ttl
+        )
@@ -1,3 +1,5 @@
+from typing import Any, Dict, Hashable, Tuple
+
 from langchain_text_splitters import (
     CharacterTextSplitter,
     RecursiveCharacterTextSplitter,
@@ -21,10 +23,27 @@ class SplitterFactory:
         SplitterType.HTML: HTMLHeaderTextSplitter,
         SplitterType.CODE: CodeSplitter,
     }
+    # Splitters hold only their configuration, so one instance per
+    # (type, config) is shared instead of being rebuilt for every document
+    _cache: Dict[Tuple[SplitterType, Hashable], TextSplitter] = {}
 
     @classmethod
     def get_splitter(cls, splitter_type: SplitterType, config: SplitterConfig = {}) -> TextSplitter:
         if splitter_type not in cls._splitters:
             raise ValueError(f"Unknown splitter type: {splitter_type}")
 
-        return cls._splitters[splitter_type](**config)
+        key = (splitter_type, _freeze(config))
+        splitter = cls._cache.get(key)
+        if splitter is None:
+            splitter = cls._splitters[splitter_type](**config)
+            cls._cache[key] = splitter
+        return splitter
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn a splitter config into a hashable cache key."""
+    if isinstance(value, dict):
+        return frozenset((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
@@ -0,0 +1,106 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+
+from app.utils.cache import LRUCache
+from app.utils.chunking import generate_content_hash
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+class Tokenizer(ABC):
+    """
+    Base class for token counting backends.
+
+    Counts are cached by SHA-256 content hash (the hash used for parent
+    chunk dedup), so re-ingested or repeated text is not tokenized again.
+    Backends only implement `_count_batch`.
+    """
+
+    def __init__(self, cache_size: int = 50000):
+        self.cache: Optional[LRUCache[str, int]] = (
+            LRUCache(max_size=cache_size) if cache_size > 0 else None
+        )
+
+    @abstractmethod
+    def _count_batch(self, texts: Sequence[str]) -> List[int]:
+        """Token counts of one batch, in input order"""
+
+    def count(self, texts: Sequence[str]) -> List[int]:
+        """
+        Count tokens of many texts, tokenizing each distinct uncached text once.
+
+        Returns:
+            Token counts in input order
+        """
+        hashes = [generate_content_hash(text) for text in texts]
+        counts: Dict[str, int] = {}
+        pending: Dict[str, str] = {}
+        for content_hash, text in zip(hashes, texts):
+            if content_hash in counts or content_hash in pending:
+                continue
+            cached = self.cache.get(content_hash) if self.cache is not None else None
+            if cached is None:
+                pending[content_hash] = text
+            else:
+                counts[content_hash] = cached
+
+        if pending:
+            for content_hash, count in zip(pending, self._count_batch(list(pending.values()))):
+                counts[content_hash] = count
+                if self.cache is not None:
+                    self.cache.set(content_hash, count)
+        return [counts[content_hash] for content_hash in hashes]
+
+    def count_one(self, text: str) -> int:
+        """Token count of a single text"""
+        return self.count([text])[0]
+
+
+class RegexTokenizer(Tokenizer):
+    """
+    Offline approximation: every word and every punctuation character is
+    one token. BPE tokenizers split rare words further, so this undercounts
+    somewhat; it needs no model files, which suits tests and benchmarks.
+    """
+
+    def _count_batch(self, texts: Sequence[str]) -> List[int]:
+        return [sum(1 for _ in _TOKEN_PATTERN.finditer(text)) for text in texts]
+
+
+class TiktokenTokenizer(Tokenizer):
+    """
+    Exact BPE counts with tiktoken.
+
+    The encoding is loaded once per process. Batches of at least
+    `parallel_min_texts` texts are encoded on tiktoken's thread pool, which
+    runs outside the GIL; smaller batches are encoded inline, where thread
+    start-up would cost more than it saves.
+
+    Args:
+        encoding: tiktoken encoding name, e.g. "cl100k_base"
+        workers: Threads used for large batches
+        parallel_min_texts: Batch size from which the thread pool is used
+        cache_size: Entries in the count cache, 0 to disable it
+    """
+
+    def __init__(
+        self,
+        encoding: str = "cl100k_base",
+        workers: int = 4,
+        parallel_min_texts: int = 256,
+        cache_size: int = 50000
+    ):
+        super().__init__(cache_size=cache_size)
+        # Only needed for this backend
+        import tiktoken
+
+        self.encoding = tiktoken.get_encoding(encoding)
+        self.workers = workers
+        self.parallel_min_texts = parallel_min_texts
+
+    def _count_batch(self, texts: Sequence[str]) -> List[int]:
+        if len(texts) < self.parallel_min_texts:
+            return [len(self.encoding.encode_ordinary(text)) for text in texts]
+        encoded = self.encoding.encode_ordinary_batch(list(texts), num_threads=self.workers)
+        return [len(tokens) for tokens in encoded]
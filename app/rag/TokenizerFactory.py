@@ -0,0 +1,35 @@
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.rag.Tokenizer import RegexTokenizer, TiktokenTokenizer, Tokenizer
+from app.rag.constants.enum import TokenizerType
+
+
+class TokenizerFactory:
+    _tokenizers = {
+        TokenizerType.REGEX: RegexTokenizer,
+        TokenizerType.TIKTOKEN: TiktokenTokenizer,
+    }
+    _default: Optional[Tokenizer] = None
+
+    @classmethod
+    def get_tokenizer(cls, tokenizer_type: TokenizerType, config: Dict[str, Any] = {}) -> Tokenizer:
+        if tokenizer_type not in cls._tokenizers:
+            raise ValueError(f"Unknown tokenizer type: {tokenizer_type}")
+
+        return cls._tokenizers[tokenizer_type](**config)
+
+    @classmethod
+    def get_default(cls) -> Tokenizer:
+        """Process-wide tokenizer configured from settings, loaded once per process"""
+        if cls._default is None:
+            tokenizer_type = TokenizerType(settings.TOKENIZER_BACKEND)
+            config: Dict[str, Any] = {"cache_size": settings.TOKENIZER_CACHE_SIZE}
+            if tokenizer_type == TokenizerType.TIKTOKEN:
+                config.update({
+                    "encoding": settings.TOKENIZER_ENCODING,
+                    "workers": settings.TOKENIZER_WORKERS,
+                    "parallel_min_texts": settings.TOKENIZER_PARALLEL_MIN_TEXTS,
+                })
+            cls._default = cls.get_tokenizer(tokenizer_type, config)
+        return cls._default
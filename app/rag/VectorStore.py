@@ -0,0 +1,475 @@
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.utils.file_storage import atomic_write
+
+# (child_id, parent_id, cosine similarity)
+VectorHit = Tuple[str, str, float]
+
+
+@dataclass
+class _Segment:
+    """A persisted, immutable run of rows and the files holding it."""
+    vectors_file: str
+    ids_file: str
+    vectors: np.ndarray
+
+
+class VectorStore:
+    """
+    Embedded vector store for child chunk embeddings.
+
+    Vectors are L2-normalised on insert, so cosine similarity is a
+    matrix-vector product. Below `ann_threshold` vectors every search is
+    exact brute force; above it an IVF (inverted file) index over k-means
+    centroids restricts each search to the `n_probe` closest clusters plus
+    any vectors added since the index was last built.
+
+    Rows live in read-only, memory-mapped segment files followed by an
+    in-RAM tail of rows added since the last save, so neither startup nor
+    the first insert reads the corpus into RAM. A save writes the tail as a
+    new segment, merging it with preceding segments of similar size to
+    keep the segment count logarithmic, then swaps in a manifest listing
+    the live segments; segment files are never modified, so a crash leaves
+    either the old or the new manifest, each naming complete files.
+
+    Rows of deleted parent chunks are tombstoned rather than compacted away,
+    which keeps row positions (and so the IVF lists) stable.
+    """
+
+    MANIFEST_FILE = "manifest.json"
+    # Layout written before segments were introduced, still loadable
+    VECTORS_FILE = "vectors.npy"
+    IDS_FILE = "ids.json"
+    IVF_FILE = "ivf.npz"
+    _default: Optional["VectorStore"] = None
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        ann_threshold: int = settings.VECTOR_ANN_THRESHOLD,
+        n_lists: int = settings.VECTOR_IVF_LISTS,
+        n_probe: int = settings.VECTOR_IVF_PROBE
+    ):
+        self.directory = directory
+        self.ann_threshold = ann_threshold
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.dim: Optional[int] = None
+        self._segments: List[_Segment] = []
+        self._persisted = 0
+        # Rows [_persisted, _count) in a growable buffer
+        self._tail: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        self._count = 0
+        self._child_ids: List[str] = []
+        self._parent_ids: List[str] = []
+        # IVF index: centroids plus CSR-style list of member row indices
+        self._centroids: Optional[np.ndarray] = None
+        self._list_offsets: Optional[np.ndarray] = None
+        self._list_members: Optional[np.ndarray] = None
+        self._indexed_count = 0
+        self._ivf_file: Optional[str] = None
+        self._ivf_dirty = False
+        # Sorted row positions of removed vectors
+        self._removed: np.ndarray = np.empty(0, dtype=np.int64)
+        self._next_file = 0
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count - len(self._removed)
+
+    @classmethod
+    def get_default(cls) -> "VectorStore":
+        """Process-wide store persisted under settings.VECTOR_STORE_DIR"""
+        if cls._default is None:
+            cls._default = cls.load(Path(settings.VECTOR_STORE_DIR))
+        return cls._default
+
+    @classmethod
+    def load(cls, directory: Path, **kwargs) -> "VectorStore":
+        """
+        Load a persisted store, memory-mapping its segments.
+        Returns an empty store bound to `directory` if nothing is persisted.
+        """
+        store = cls(directory=directory, **kwargs)
+        manifest_path = directory / cls.MANIFEST_FILE
+        if manifest_path.exists():
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            segments = [(s["vectors"], s["ids"]) for s in manifest["segments"]]
+            removed = manifest["removed"]
+            store._ivf_file = manifest["ivf"]
+            store._next_file = manifest["next_file"]
+        elif (directory / cls.VECTORS_FILE).exists():
+            # The legacy pair doubles as a single segment
+            segments = [(cls.VECTORS_FILE, cls.IDS_FILE)]
+            with open(directory / cls.IDS_FILE, "r") as f:
+                removed = json.load(f).get("removed", [])
+            if (directory / cls.IVF_FILE).exists():
+                store._ivf_file = cls.IVF_FILE
+        else:
+            return store
+
+        for vectors_file, ids_file in segments:
+            vectors = np.load(directory / vectors_file, mmap_mode="r")
+            with open(directory / ids_file, "r") as f:
+                ids = json.load(f)
+            store._segments.append(_Segment(vectors_file, ids_file, vectors))
+            store._child_ids.extend(ids["child_ids"])
+            store._parent_ids.extend(ids["parent_ids"])
+            store.dim = vectors.shape[1]
+        store._persisted = store._count = len(store._child_ids)
+        store._removed = np.asarray(removed, dtype=np.int64)
+
+        if store._ivf_file is not None:
+            ivf = np.load(directory / store._ivf_file)
+            store._centroids = ivf["centroids"]
+            store._list_offsets = ivf["list_offsets"]
+            store._list_members = ivf["list_members"]
+            store._indexed_count = int(ivf["indexed_count"])
+        return store
+
+    def save(self) -> None:
+        """
+        Persist rows added since the last save, the tombstones and the IVF
+        index to `directory`.
+
+        Only the tail and the segments it is merged with are written, and
+        outside the store lock, so searches and inserts keep running while
+        the files are written.
+        """
+        if self.directory is None:
+            raise ValueError("VectorStore has no directory to save to")
+        # Saves are serialised so an older snapshot never replaces a newer one
+        with self._save_lock:
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                segments = list(self._segments)
+                start, end = self._persisted, self._count
+                # Appends never rewrite rows below _count and a grown buffer
+                # replaces this one, so the view stays stable without a copy
+                tail = self._tail[:end - start]
+                removed = self._removed.tolist()
+                ivf = None
+                if self._ivf_dirty:
+                    ivf = {
+                        "centroids": self._centroids,
+                        "list_offsets": self._list_offsets,
+                        "list_members": self._list_members,
+                        "indexed_count": np.int64(self._indexed_count),
+                    }
+                    self._ivf_dirty = False
+
+            try:
+                if end > start:
+                    segments.append(self._write_segment([tail], start))
+                    segments = self._merge_segments(segments)
+                ivf_file = self._ivf_file
+                if ivf is not None:
+                    ivf_file = self._write_ivf(ivf)
+                manifest = {
+                    "segments": [{"vectors": s.vectors_file, "ids": s.ids_file} for s in segments],
+                    "removed": removed,
+                    "ivf": ivf_file,
+                    "next_file": self._next_file,
+                }
+                # The manifest is the commit point: swapping it publishes the
+                # new segments and retires the merged ones together
+                atomic_write(
+                    self.directory / self.MANIFEST_FILE,
+                    lambda f: f.write(json.dumps(manifest).encode("utf-8"))
+                )
+            except BaseException:
+                if ivf is not None:
+                    with self._lock:
+                        self._ivf_dirty = True
+                raise
+
+            with self._lock:
+                self._segments = segments
+                self._ivf_file = ivf_file
+                self._tail = self._tail[end - start:self._count - start].copy()
+                self._persisted = end
+            self._remove_unreferenced(segments, ivf_file)
+
+    def add(
+        self,
+        vectors: np.ndarray,
+        parent_ids: Sequence[str],
+        child_ids: Optional[Sequence[str]] = None
+    ) -> None:
+        """
+        Append child chunk embeddings.
+
+        Args:
+            vectors: (n, dim) array of embeddings
+            parent_ids: Parent chunk ID for each row
+            child_ids: Optional child chunk IDs; defaults to row positions
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(parent_ids):
+            raise ValueError("vectors must be (n, dim) with one parent_id per row")
+        if len(vectors) == 0:
+            return
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            if vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+
+            offset = self._count - self._persisted
+            self._reserve(offset + len(vectors))
+            self._tail[offset:offset + len(vectors)] = _normalize(vectors)
+            if child_ids is None:
+                child_ids = [str(i) for i in range(self._count, self._count + len(vectors))]
+            self._child_ids.extend(str(c) for c in child_ids)
+            self._parent_ids.extend(str(p) for p in parent_ids)
+            self._count += len(vectors)
+
+            # Rebuild the IVF index once the unindexed tail grows past 10%
+            if self._count >= self.ann_threshold and (
+                self._centroids is None
+                or self._count - self._indexed_count > self._indexed_count // 10
+            ):
+                self._build_ivf()
+
+    def remove_parents(self, parent_ids: Iterable[str]) -> int:
+        """
+        Tombstone every vector belonging to the given parent chunks so they
+        no longer appear in search results.
+
+        Returns:
+            Number of vectors removed
+        """
+        targets = {str(p) for p in parent_ids}
+        if not targets:
+            return 0
+        with self._lock:
+            rows = np.fromiter(
+                (row for row, parent_id in enumerate(self._parent_ids) if parent_id in targets),
+                dtype=np.int64
+            )
+            before = len(self._removed)
+            self._removed = np.union1d(self._removed, rows)
+            return len(self._removed) - before
+
+    def search(self, query: np.ndarray, top_k: int = 10) -> List[VectorHit]:
+        """
+        Find the child chunks most similar to `query` by cosine similarity.
+
+        Returns:
+            Up to top_k (child_id, parent_id, score) tuples, best first
+        """
+        with self._lock:
+            if self._count == 0 or top_k <= 0:
+                return []
+            q = _normalize(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+
+            if self._centroids is None:
+                candidates = None
+                scores = np.concatenate([block @ q for _, block in self._blocks()])
+                if len(self._removed):
+                    scores[self._removed] = -np.inf
+            else:
+                candidates = self._ivf_candidates(q, top_k)
+                if len(candidates) == 0:
+                    return []
+                scores = self._scores(candidates, q)
+
+            k = min(top_k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            top = top[np.isfinite(scores[top])]
+            rows = top if candidates is None else candidates[top]
+            return [
+                (self._child_ids[row], self._parent_ids[row], float(score))
+                for row, score in zip(rows, scores[top])
+            ]
+
+    def _ivf_candidates(self, q: np.ndarray, top_k: int) -> np.ndarray:
+        """
+        Live rows of the probed lists plus the unindexed tail. Probes twice
+        as many lists at a time until there are top_k candidates, so lists
+        thinned out by tombstones do not cut the result short.
+        """
+        assert self._centroids is not None
+        assert self._list_offsets is not None and self._list_members is not None
+        order = np.argsort(-(self._centroids @ q))
+        # Vectors added after the last build are always scanned exactly
+        unindexed = np.arange(self._indexed_count, self._count)
+        n_probe = min(self.n_probe, len(order))
+        while True:
+            parts = [
+                self._list_members[self._list_offsets[c]:self._list_offsets[c + 1]]
+                for c in order[:n_probe]
+            ]
+            parts.append(unindexed)
+            candidates = np.concatenate(parts)
+            if len(self._removed):
+                candidates = candidates[~np.isin(candidates, self._removed)]
+            if len(candidates) >= top_k or n_probe >= len(order):
+                return candidates
+            n_probe = min(2 * n_probe, len(order))
+
+    def _build_ivf(self) -> None:
+        """Cluster the live rows; tombstoned rows are left out of the lists."""
+        live = np.setdiff1d(np.arange(self._count), self._removed)
+        if len(live) == 0:
+            return
+        # Keep at least ~40 vectors per list so centroids are meaningful
+        n_lists = max(1, min(self.n_lists, len(live) // 40))
+        rng = np.random.default_rng(0)
+        sample = np.sort(rng.choice(live, min(len(live), n_lists * 256), replace=False))
+        centroids = _kmeans(self._gather(sample), n_lists)
+        assignments = np.concatenate(
+            [_assign(block, centroids) for _, block in self._blocks()])[live]
+        order = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=n_lists)
+        self._centroids = centroids
+        self._list_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self._list_members = live[order].astype(np.int64)
+        self._indexed_count = self._count
+        self._ivf_dirty = True
+
+    def _blocks(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """(first row, vectors) of each segment and of the tail, in row order."""
+        start = 0
+        for segment in self._segments:
+            yield start, segment.vectors
+            start += len(segment.vectors)
+        if self._count > self._persisted:
+            yield start, self._tail[:self._count - self._persisted]
+
+    def _scores(self, rows: np.ndarray, q: np.ndarray) -> np.ndarray:
+        """Similarity of `q` to each of `rows`, in the order given."""
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start, block in self._blocks():
+            mask = (rows >= start) & (rows < start + len(block))
+            if mask.any():
+                scores[mask] = block[rows[mask] - start] @ q
+        return scores
+
+    def _gather(self, rows: np.ndarray) -> np.ndarray:
+        """Vectors of the given rows, in the order given."""
+        assert self.dim is not None
+        out = np.empty((len(rows), self.dim), dtype=np.float32)
+        for start, block in self._blocks():
+            mask = (rows >= start) & (rows < start + len(block))
+            if mask.any():
+                out[mask] = block[rows[mask] - start]
+        return out
+
+    def _reserve(self, capacity: int) -> None:
+        assert self.dim is not None
+        # Double capacity to keep appends amortised O(1); the persisted
+        # segments are never copied
+        if len(self._tail) >= capacity:
+            return
+        new_capacity = max(capacity, 2 * len(self._tail), 1024)
+        buffer = np.empty((new_capacity, self.dim), dtype=np.float32)
+        used = self._count - self._persisted
+        if used:
+            buffer[:used] = self._tail[:used]
+        self._tail = buffer
+
+    def _merge_segments(self, segments: List[_Segment]) -> List[_Segment]:
+        """
+        Merge the last segment into its predecessor while that is at most
+        twice its size, like a binary counter: each row is rewritten
+        O(log n) times and at most O(log n) segments exist.
+        """
+        while len(segments) >= 2 and len(segments[-2].vectors) <= 2 * len(segments[-1].vectors):
+            last = segments.pop()
+            previous = segments.pop()
+            start = sum(len(s.vectors) for s in segments)
+            segments.append(self._write_segment([previous.vectors, last.vectors], start))
+        return segments
+
+    def _write_segment(self, parts: List[np.ndarray], start: int, block: int = 65536) -> _Segment:
+        """
+        Write rows starting at `start`, given as consecutive arrays, to new
+        segment files. The files are only referenced once a manifest naming
+        them is swapped in, so they are written in place.
+        """
+        assert self.directory is not None and self.dim is not None
+        name = f"segment-{self._next_file:06d}"
+        self._next_file += 1
+        rows = sum(len(part) for part in parts)
+        vectors_file, ids_file = f"{name}.npy", f"{name}.json"
+
+        out = np.lib.format.open_memmap(
+            self.directory / vectors_file, mode="w+", dtype=np.float32, shape=(rows, self.dim))
+        position = 0
+        for part in parts:
+            for offset in range(0, len(part), block):
+                chunk = part[offset:offset + block]
+                out[position:position + len(chunk)] = chunk
+                position += len(chunk)
+        out.flush()
+        del out
+
+        # Id lists only grow, so slicing rows below the snapshot is safe
+        # without the store lock
+        with open(self.directory / ids_file, "w") as f:
+            json.dump({
+                "child_ids": self._child_ids[start:start + rows],
+                "parent_ids": self._parent_ids[start:start + rows],
+            }, f)
+        vectors = np.load(self.directory / vectors_file, mmap_mode="r")
+        return _Segment(vectors_file, ids_file, vectors)
+
+    def _write_ivf(self, ivf: dict) -> str:
+        assert self.directory is not None
+        ivf_file = f"ivf-{self._next_file:06d}.npz"
+        self._next_file += 1
+        with open(self.directory / ivf_file, "wb") as f:
+            np.savez(f, **ivf)
+        return ivf_file
+
+    def _remove_unreferenced(self, segments: List[_Segment], ivf_file: Optional[str]) -> None:
+        """Delete files the manifest no longer names, including leftovers of failed saves."""
+        assert self.directory is not None
+        referenced = {ivf_file}
+        for segment in segments:
+            referenced.update((segment.vectors_file, segment.ids_file))
+        legacy = {self.VECTORS_FILE, self.IDS_FILE, self.IVF_FILE}
+        for path in self.directory.iterdir():
+            managed = path.name.startswith(("segment-", "ivf-")) or path.name in legacy
+            if managed and path.name not in referenced:
+                path.unlink(missing_ok=True)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _assign(data: np.ndarray, centroids: np.ndarray, block: int = 65536) -> np.ndarray:
+    """Nearest centroid by cosine similarity, in blocks to bound memory."""
+    out = np.empty(len(data), dtype=np.int64)
+    for start in range(0, len(data), block):
+        out[start:start + block] = np.argmax(data[start:start + block] @ centroids.T, axis=1)
+    return out
+
+
+def _kmeans(sample: np.ndarray, k: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means trained on `sample`, at most 256 points per list."""
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(len(sample), k, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        filled = np.bincount(assignments, minlength=k) > 0
+        centroids[filled] = _normalize(sums[filled])
+    return centroids
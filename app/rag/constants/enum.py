@@ -15,3 +15,44 @@ class SplitterType(Enum):
     MARKDOWN = "markdown"
     HTML = "html"
     CODE = "code"
+
+
+class IngestionStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class EmbedderType(Enum):
+    HASHING = "hashing"
+
+
+class TokenizerType(Enum):
+    REGEX = "regex"
+    TIKTOKEN = "tiktoken"
+
+
+class RetrievalMode(Enum):
+    VECTOR = "vector"
+    LEXICAL = "lexical"
+    HYBRID = "hybrid"
+
+
+class NearDuplicatePolicy(Enum):
+    OFF = "off"
+    CLUSTER = "cluster"
+    # Drops near-duplicates within a document; those matching another
+    # document are clustered
+    SKIP = "skip"
+
+
+class RetrievalCacheType(Enum):
+    MEMORY = "memory"
+    REDIS = "redis"
+    NONE = "none"
+
+
+class LexicalBackend(Enum):
+    POSTGRES = "postgres"
+    MEMORY = "memory"
@@ -1,4 +1,6 @@
-from typing import TypedDict, Callable
+from typing import Any, Dict, TypedDict, Callable, List
+
+from app.rag.HierarchicalSplitter import ChunkSpan
 
 
 class SplitterConfig(TypedDict, total=False):
@@ -7,3 +9,14 @@ class SplitterConfig(TypedDict, total=False):
     separator: str
     keep_separator: bool
     length_function: Callable[[str], int]
+
+
+class ChunkingProfile(TypedDict):
+    parent: SplitterConfig
+    child: SplitterConfig
+
+
+class IngestionResult(TypedDict):
+    child_chunks: List[ChunkSpan]
+    parent_chunk_data: List[Dict[str, Any]]
+    timings: Dict[str, float]
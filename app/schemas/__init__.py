@@ -1,16 +1,34 @@
 # Pydantic schemas
+from app.schemas.document import (
+    DocumentBase,
+    DocumentCreate,
+    DocumentResponse
+)
 from app.schemas.parent_chunk import (
     ParentChunkBase,
     ParentChunkCreate,
     ParentChunkUpdate,
     ParentChunkResponse,
-    ParentChunkInDB
+    ParentChunkInDB,
+    ParentChunkSummary,
+    ParentChunkPage
+)
+from app.schemas.retrieve import (
+    RetrieveRequest,
+    RetrieveResponse
 )
 
 __all__ = [
+    "DocumentBase",
+    "DocumentCreate",
+    "DocumentResponse",
     "ParentChunkBase",
     "ParentChunkCreate", 
     "ParentChunkUpdate",
     "ParentChunkResponse",
-    "ParentChunkInDB"
+    "ParentChunkInDB",
+    "ParentChunkSummary",
+    "ParentChunkPage",
+    "RetrieveRequest",
+    "RetrieveResponse"
 ]
@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+
+
+class DocumentBase(BaseModel):
+    """Base schema with common fields for documents"""
+    file_hash: str = Field(..., min_length=64, max_length=64,
+                           description="SHA-256 hash of the uploaded file")
+    filename: str = Field(..., description="Original filename provided by user")
+    file_path: Optional[str] = Field(None, description="Path where the file is stored")
+    file_size: Optional[int] = Field(None, ge=0, description="Size of the file in bytes")
+    document_type: Optional[str] = Field(None, description="Document type, e.g. pdf, docx, txt")
+
+
+class DocumentCreate(DocumentBase):
+    """Schema for registering an uploaded document"""
+    pass
+
+
+class DocumentResponse(DocumentBase):
+    """Schema for document response"""
+    id: UUID
+    status: str = Field(..., description="One of queued, running, completed, failed")
+    parent_chunk_count: int
+    child_chunk_count: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    # Pydantic v2 config
+    model_config = ConfigDict(from_attributes=True)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, Dict, Any
+from pydantic import AliasChoices, BaseModel, Field, ConfigDict
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from uuid import UUID
 
@@ -15,13 +15,22 @@ class ParentChunkBase(BaseModel):
     char_count: Optional[int] = Field(
         None, ge=0, description="Character count of this chunk")
     metadata: Optional[Dict[str, Any]] = Field(
-        default_factory=dict, description="Flexible metadata storage")
+        default_factory=dict, description="Flexible metadata storage",
+        validation_alias=AliasChoices("chunk_metadata", "metadata"))
 
 
 class ParentChunkCreate(ParentChunkBase):
     """Schema for creating a new parent chunk"""
+    id: Optional[UUID] = Field(
+        None, description="Pre-assigned ID, e.g. when child chunks already reference it")
+    document_id: Optional[UUID] = Field(
+        None, description="ID of the document this chunk was produced from")
     content_hash: str = Field(..., min_length=64, max_length=64,
                               description="SHA-256 hash of content")
+    minhash: Optional[bytes] = Field(
+        None, description="MinHash signature of content, computed at ingest")
+    near_duplicate_of: Optional[UUID] = Field(
+        None, description="ID of the canonical chunk this one nearly duplicates")
 
 
 class ParentChunkUpdate(BaseModel):
@@ -37,7 +46,9 @@ class ParentChunkUpdate(BaseModel):
 class ParentChunkResponse(ParentChunkBase):
     """Schema for parent chunk response"""
     id: UUID
+    document_id: Optional[UUID] = None
     content_hash: str
+    near_duplicate_of: Optional[UUID] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -48,3 +59,29 @@ class ParentChunkResponse(ParentChunkBase):
 class ParentChunkInDB(ParentChunkResponse):
     """Schema representing parent chunk as stored in database"""
     pass
+
+
+class ParentChunkSummary(BaseModel):
+    """Schema for listing parent chunks without their content"""
+    id: UUID
+    document_id: Optional[UUID] = None
+    content_hash: str
+    near_duplicate_of: Optional[UUID] = None
+    chunk_index: int
+    token_count: Optional[int] = None
+    char_count: Optional[int] = None
+    metadata: Optional[Dict[str, Any]] = Field(
+        default_factory=dict, description="Flexible metadata storage",
+        validation_alias=AliasChoices("chunk_metadata", "metadata"))
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    # Pydantic v2 config
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ParentChunkPage(BaseModel):
+    """Schema for a keyset-paginated page of parent chunks"""
+    items: List[ParentChunkResponse] | List[ParentChunkSummary]
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page; absent on the last page")
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from app.rag.constants.enum import RetrievalMode
+from app.schemas.parent_chunk import ParentChunkResponse
+
+
+class RetrieveRequest(BaseModel):
+    """Schema for a retrieval query"""
+    query: str = Field(..., min_length=1, description="Search text")
+    top_k: int = Field(5, ge=1, le=50, description="Maximum number of parent chunks to return")
+    mode: Optional[RetrievalMode] = Field(
+        None, description="vector, lexical or hybrid; defaults to RETRIEVAL_MODE")
+    token_budget: Optional[int] = Field(
+        None, ge=1, description="Only return the best parents that fit this many prompt tokens")
+
+
+class RetrieveResponse(BaseModel):
+    """Schema for retrieval results"""
+    query: str = Field(..., description="The query as received")
+    mode: RetrievalMode = Field(..., description="Retrieval mode that was used")
+    results: List[ParentChunkResponse] = Field(
+        ..., description="Distinct parent chunks, best match first")
+    total_tokens: Optional[int] = Field(
+        None, description="Prompt tokens the results use, including per-result overhead; "
+        "what is counted against token_budget")
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
+from typing import Optional
 from datetime import datetime
+from uuid import UUID
 
 
 class UploadResponse(BaseModel):
@@ -8,6 +10,35 @@ class UploadResponse(BaseModel):
     original_filename: str = Field(..., description="Original filename provided by user")
     file_path: str = Field(..., description="Path where the file is stored")
     file_size: int = Field(..., description="Size of the file in bytes")
+    file_hash: str = Field(..., description="SHA-256 hash of the file contents")
     content_type: str = Field(..., description="MIME type of the file")
     uploaded_at: datetime = Field(..., description="Timestamp of upload")
+    document_id: UUID = Field(..., description="ID of the document registered for this file")
+    job_id: Optional[str] = Field(
+        None, description="ID of the ingestion job processing this file, if still in history")
+    job_status: str = Field(..., description="Status of the ingestion job")
+    duplicate: bool = Field(
+        default=False, description="True if identical contents were already ingested and the upload was skipped")
     message: str = Field(default="File uploaded successfully", description="Success message")
+
+
+class IngestionJobResponse(BaseModel):
+    """Schema for ingestion job status response"""
+    job_id: str = Field(..., description="ID of the ingestion job")
+    document_id: Optional[UUID] = Field(None, description="ID of the document being ingested")
+    status: str = Field(..., description="One of queued, running, completed, failed")
+    file_path: str = Field(..., description="Path of the file being ingested")
+    created_at: datetime = Field(..., description="Timestamp the job was queued")
+    started_at: Optional[datetime] = Field(None, description="Timestamp processing started")
+    finished_at: Optional[datetime] = Field(None, description="Timestamp processing finished")
+    parent_chunk_count: Optional[int] = Field(None, description="Number of parent chunks produced")
+    child_chunk_count: Optional[int] = Field(None, description="Number of child chunks produced")
+    duplicate_chunk_count: Optional[int] = Field(
+        None, description="Number of parent chunks skipped as already stored")
+    near_duplicate_chunk_count: Optional[int] = Field(
+        None, description="Number of parent chunks matched as near-duplicates of a stored chunk")
+    moved_chunk_count: Optional[int] = Field(
+        None, description="Number of kept parent chunks re-positioned by a re-ingest")
+    removed_chunk_count: Optional[int] = Field(
+        None, description="Number of parent chunks deleted by a re-ingest")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
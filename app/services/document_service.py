@@ -0,0 +1,164 @@
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select, update
+
+from app.core.metrics import span
+from app.models.document import Document
+from app.rag.constants.enum import IngestionStatus
+from app.schemas.document import DocumentCreate
+from app.services.parent_chunk_service import ParentChunkService
+
+
+class DocumentService:
+    """Service class for document operations"""
+
+    @staticmethod
+    @span("db.document_create")
+    async def create(db: AsyncSession, document_data: DocumentCreate) -> Document:
+        """
+        Register an uploaded document.
+
+        Args:
+            db: Database session
+            document_data: Document creation data
+
+        Returns:
+            Created Document instance, with status queued
+        """
+        document = Document(**document_data.model_dump(), status=IngestionStatus.QUEUED.value)
+        db.add(document)
+        await db.commit()
+        await db.refresh(document)
+        return document
+
+    @staticmethod
+    @span("db.document_get_by_id")
+    async def get_by_id(db: AsyncSession, document_id: UUID) -> Optional[Document]:
+        """
+        Get document by ID.
+
+        Args:
+            db: Database session
+            document_id: UUID of the document
+
+        Returns:
+            Document instance or None
+        """
+        result = await db.execute(
+            select(Document).where(Document.id == document_id)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    @span("db.document_get_by_file_hash")
+    async def get_by_file_hash(db: AsyncSession, file_hash: str) -> Optional[Document]:
+        """
+        Get the most recent document with identical file contents whose
+        ingestion has not failed (for whole-file deduplication).
+
+        Args:
+            db: Database session
+            file_hash: SHA-256 hash of the file
+
+        Returns:
+            Document instance or None
+        """
+        result = await db.execute(
+            select(Document)
+            .where(Document.file_hash == file_hash)
+            .where(Document.status != IngestionStatus.FAILED.value)
+            .order_by(Document.created_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    @span("db.document_update_source")
+    async def update_source(
+        db: AsyncSession,
+        document_id: UUID,
+        document_data: DocumentCreate
+    ) -> Optional[Document]:
+        """
+        Point a document at a newly uploaded version of its file and queue
+        it again. Its chunks are left alone until the re-ingest swaps them.
+
+        Args:
+            db: Database session
+            document_id: UUID of the document
+            document_data: Metadata of the new upload
+
+        Returns:
+            Updated Document instance or None if not found
+        """
+        document = await DocumentService.get_by_id(db, document_id)
+        if not document:
+            return None
+
+        for field, value in document_data.model_dump().items():
+            setattr(document, field, value)
+        document.status = IngestionStatus.QUEUED.value
+
+        await db.commit()
+        await db.refresh(document)
+        return document
+
+    @staticmethod
+    @span("db.document_update_status")
+    async def update_status(
+        db: AsyncSession,
+        document_id: UUID,
+        status: IngestionStatus,
+        parent_chunk_count: Optional[int] = None,
+        child_chunk_count: Optional[int] = None,
+        commit: bool = True
+    ) -> None:
+        """
+        Set a document's ingestion status, and its chunk counts if given,
+        in a single UPDATE.
+
+        Args:
+            db: Database session
+            document_id: UUID of the document
+            status: New ingestion status
+            parent_chunk_count: Parent chunks now stored for the document
+            child_chunk_count: Child chunks now embedded for the document
+            commit: Commit when done. Pass False to make the update part of
+                a larger transaction.
+        """
+        values = {"status": status.value}
+        if parent_chunk_count is not None:
+            values["parent_chunk_count"] = parent_chunk_count
+        if child_chunk_count is not None:
+            values["child_chunk_count"] = child_chunk_count
+        await db.execute(
+            update(Document).where(Document.id == document_id).values(**values)
+        )
+        if commit:
+            await db.commit()
+
+    @staticmethod
+    @span("db.document_delete")
+    async def delete(db: AsyncSession, document_id: UUID) -> Optional[List[UUID]]:
+        """
+        Delete a document and all of its parent chunks in one transaction:
+        one DELETE for the chunks and one for the document row.
+
+        Args:
+            db: Database session
+            document_id: UUID of the document
+
+        Returns:
+            IDs of the deleted parent chunks, or None if the document was not found
+        """
+        removed = await ParentChunkService.delete_by_document(db, document_id, commit=False)
+        result = await db.execute(
+            delete(Document).where(Document.id == document_id).returning(Document.id)
+        )
+        if result.scalar_one_or_none() is None:
+            await db.rollback()
+            return None
+        await db.commit()
+        ParentChunkService.forget(removed)
+        return removed
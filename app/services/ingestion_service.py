@@ -0,0 +1,591 @@
+import asyncio
+import logging
+import multiprocessing
+import queue
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.managers import SyncManager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core import metrics
+from app.core.metrics import span
+from app.db.session import SessionLocal
+from app.rag.EmbedderFactory import EmbedderFactory
+from app.rag.NearDuplicateIndex import NearDuplicateIndex
+from app.rag.RagFacade import RagFacade
+from app.rag.RetrievalCache import RetrievalCache
+from app.rag.VectorStore import VectorStore
+from app.rag.RagException import IngestionQueueFullException
+from app.rag.constants.enum import DocumentType, IngestionStatus, NearDuplicatePolicy
+from app.rag.constants.types import IngestionResult
+from app.schemas.parent_chunk import ParentChunkCreate
+from app.services.document_service import DocumentService
+from app.services.parent_chunk_service import ParentChunkService
+
+# Metadata keys that locate a chunk within its document; a reused chunk is
+# only re-positioned when one of these or its chunk_index changed
+POSITION_METADATA_KEYS = ("page", "start_index", "end_index")
+# Attempts at persisting an in-process index after a job commits, and the
+# base delay in seconds between them
+SAVE_ATTEMPTS = 3
+SAVE_RETRY_DELAY = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestionJob:
+    """In-memory record of a single document ingestion job"""
+    id: str
+    file_path: Path
+    document_id: Optional[UUID] = None
+    # Re-ingest over the document's existing chunks: unchanged ones are
+    # kept, moved ones re-positioned and missing ones deleted
+    replace: bool = False
+    # Type detected at upload; sniffed from the file when not given
+    document_type: Optional[DocumentType] = None
+    # Upload of the version this job replaces; removed once the job commits
+    superseded_path: Optional[Path] = None
+    status: IngestionStatus = IngestionStatus.QUEUED
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    parent_chunk_count: Optional[int] = None
+    child_chunk_count: Optional[int] = None
+    duplicate_chunk_count: Optional[int] = None
+    # Parents matched to a similar, already stored parent; skipped or
+    # clustered per settings.NEAR_DUPLICATE_POLICY
+    near_duplicate_chunk_count: Optional[int] = None
+    moved_chunk_count: Optional[int] = None
+    removed_chunk_count: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class _RunState:
+    """Bookkeeping shared by every batch of one running job"""
+    # content_hash -> ID of the parent stored for it in this version
+    stored: Dict[str, UUID] = field(default_factory=dict)
+    # Parent IDs that received vectors during the job
+    indexed: List[str] = field(default_factory=list)
+    # Canonical parents of this job, matched against by its later batches
+    # and added to the shared near-duplicate index once the job commits
+    near_duplicates: Optional[NearDuplicateIndex] = None
+    # content_hash -> stored row (id, chunk_index, metadata) of the previous
+    # version, when re-ingesting
+    previous: Dict[str, Any] = field(default_factory=dict)
+    # New chunk_index/metadata for kept chunks whose position changed
+    moved: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class IngestionService:
+    """
+    Runs RagFacade.ingest in a bounded worker pool so document parsing and
+    splitting never block the event loop.
+
+    Jobs are queued as asyncio tasks; a semaphore caps how many run in the
+    executor at once and `max_pending` caps how many may wait for a slot.
+    Each running job streams page-window batches from the worker through a
+    bounded queue and persists them as they arrive, all in one transaction:
+    a document's chunks become visible together when the job completes, and
+    a replace job swaps out the previous version atomically.
+
+    Replace jobs are incremental: the new chunk hash sequence is diffed
+    against the stored one, so only new chunks are inserted and embedded,
+    missing ones are deleted and moved ones get their chunk_index updated
+    in bulk. Re-ingest cost follows the size of the edit.
+
+    Jobs of the same document run one at a time in submission order, so a
+    replace job always diffs against the version the previous job
+    committed rather than both diffing against the same snapshot.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = settings.INGEST_MAX_WORKERS,
+        max_pending: int = settings.INGEST_MAX_PENDING_JOBS,
+        history_size: int = settings.INGEST_JOB_HISTORY_SIZE,
+        executor_type: str = settings.INGEST_EXECUTOR,
+        max_buffered_batches: int = settings.INGEST_MAX_BUFFERED_BATCHES
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.history_size = history_size
+        self.executor_type = executor_type
+        self.max_buffered_batches = max_buffered_batches
+        self._executor: Optional[Executor] = None
+        self._manager: Optional[SyncManager] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+        # document_id -> (lock, jobs holding or waiting for it)
+        self._document_locks: Dict[UUID, Tuple[asyncio.Lock, int]] = {}
+
+    def start(self) -> None:
+        """Create the worker pool. Call once from the application lifespan."""
+        if self._executor is not None:
+            return
+        if self.executor_type == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            # Batch queues must be shareable with worker processes
+            self._manager = multiprocessing.Manager()
+        elif self.executor_type == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="ingest")
+        else:
+            raise ValueError(f"Unknown executor type: {self.executor_type}")
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+
+    async def shutdown(self) -> None:
+        """Cancel outstanding jobs and tear down the worker pool."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._tasks)
+
+    def submit(
+        self,
+        file_path: Path,
+        document_id: Optional[UUID] = None,
+        replace: bool = False,
+        document_type: Optional[DocumentType] = None,
+        superseded_path: Optional[Path] = None
+    ) -> IngestionJob:
+        """
+        Queue a file for ingestion and return immediately.
+
+        Args:
+            file_path: Path of the stored upload
+            document_id: Document the file was registered as
+            replace: Replace the document's existing chunks with the new ones
+            document_type: Type detected at upload, saves sniffing the file again
+            superseded_path: Upload of the version being replaced, deleted
+                once the job commits
+
+        Returns:
+            The queued IngestionJob
+
+        Raises:
+            IngestionQueueFullException: If max_pending jobs are already waiting
+        """
+        if self._executor is None:
+            self.start()
+        if self.pending_count >= self.max_pending:
+            raise IngestionQueueFullException()
+
+        if replace and document_id is None:
+            raise ValueError("replace requires a document_id")
+
+        job = IngestionJob(
+            id=str(uuid.uuid4()), file_path=file_path,
+            document_id=document_id, replace=replace, document_type=document_type,
+            superseded_path=superseded_path)
+        self._remember(job)
+
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[IngestionJob]:
+        """Get a job by ID, or None if unknown or evicted from history"""
+        return self._jobs.get(job_id)
+
+    def get_latest_job(self, document_id: UUID) -> Optional[IngestionJob]:
+        """Get the most recent job for a document still in history, or None"""
+        for job in reversed(self._jobs.values()):
+            if job.document_id == document_id:
+                return job
+        return None
+
+    async def _run(self, job: IngestionJob) -> None:
+        assert self._semaphore is not None
+        # Jobs outlive the request that queued them
+        metrics.stop_request_timing()
+        async with self._document_turn(job.document_id), self._semaphore:
+            job.status = IngestionStatus.RUNNING
+            job.started_at = datetime.utcnow()
+            job.parent_chunk_count = 0
+            job.child_chunk_count = 0
+            job.duplicate_chunk_count = 0
+            job.near_duplicate_chunk_count = 0
+            job.moved_chunk_count = 0
+            job.removed_chunk_count = 0
+            state = _RunState()
+            committed = False
+            loop = asyncio.get_running_loop()
+            batches = self._new_queue()
+            try:
+                async with SessionLocal() as db:
+                    if job.document_id is not None:
+                        await DocumentService.update_status(
+                            db, job.document_id, IngestionStatus.RUNNING)
+                    if job.replace:
+                        state.previous = await ParentChunkService.get_document_index(
+                            db, job.document_id)
+
+                    producer = loop.run_in_executor(
+                        self._executor, RagFacade.ingest_to_queue, job.file_path, batches,
+                        job.document_type)
+                    try:
+                        while True:
+                            result = await asyncio.to_thread(batches.get)
+                            if result is None:
+                                break
+                            await self._persist(job, db, result, state)
+                    except BaseException:
+                        await _stop_producer(job, producer, batches)
+                        raise
+                    await producer
+
+                    # Chunks of the previous version that no longer occur
+                    removed = [
+                        row.id for content_hash, row in state.previous.items()
+                        if content_hash not in state.stored
+                    ]
+                    await ParentChunkService.delete_by_ids(db, removed, commit=False)
+                    await ParentChunkService.update_positions(db, state.moved, commit=False)
+                    job.removed_chunk_count = len(removed)
+                    job.moved_chunk_count = len(state.moved)
+
+                    if job.document_id is not None:
+                        await DocumentService.update_status(
+                            db, job.document_id, IngestionStatus.COMPLETED,
+                            parent_chunk_count=len(state.stored),
+                            child_chunk_count=job.child_chunk_count,
+                            commit=False)
+                    await db.commit()
+                committed = True
+                await self._after_commit(job, state, removed)
+                job.status = IngestionStatus.COMPLETED
+            except asyncio.CancelledError:
+                if committed:
+                    job.status = IngestionStatus.COMPLETED
+                else:
+                    await self._discard(job, state)
+                    job.status = IngestionStatus.FAILED
+                    job.error = "Ingestion cancelled"
+                raise
+            except Exception as e:
+                if committed:
+                    logger.exception("Post-commit step of ingestion job %s failed", job.id)
+                    job.status = IngestionStatus.COMPLETED
+                else:
+                    await self._discard(job, state)
+                    job.status = IngestionStatus.FAILED
+                    job.error = str(e)
+            finally:
+                job.finished_at = datetime.utcnow()
+                metrics.INGESTION_JOBS.labels(job.status.value).inc()
+
+    @asynccontextmanager
+    async def _document_turn(self, document_id: Optional[UUID]) -> AsyncIterator[None]:
+        """Wait until no other job of the document is running."""
+        if document_id is None:
+            yield
+            return
+        lock, users = self._document_locks.get(document_id, (asyncio.Lock(), 0))
+        self._document_locks[document_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._document_locks[document_id]
+            if users == 1:
+                del self._document_locks[document_id]
+            else:
+                self._document_locks[document_id] = (lock, users - 1)
+
+    async def _after_commit(self, job: IngestionJob, state: _RunState, removed: List[UUID]) -> None:
+        """
+        Bring the in-process indexes in line with a committed job and persist
+        them. The chunks are already committed, so failures here are logged
+        instead of failing the job: rolling back would drop vectors of
+        stored parents. A store that could not be saved is written again by
+        the next successful save.
+        """
+        ParentChunkService.forget([*removed, *(position["id"] for position in state.moved)])
+        store = VectorStore.get_default()
+        with span("ingest.vector_save"):
+            await asyncio.to_thread(store.remove_parents, [str(i) for i in removed])
+            await _save_with_retry(store.save, "vector store")
+        added = state.near_duplicates
+        if _near_duplicate_policy() != NearDuplicatePolicy.OFF and (removed or added):
+            near_duplicates = NearDuplicateIndex.get_default()
+            with span("ingest.near_duplicate_save"):
+                await asyncio.to_thread(near_duplicates.remove, [str(i) for i in removed])
+                if added:
+                    await asyncio.to_thread(near_duplicates.add, *added.entries())
+                await _save_with_retry(near_duplicates.save, "near-duplicate index")
+        await RetrievalCache.invalidate_default()
+        if job.superseded_path is not None and job.superseded_path != job.file_path:
+            job.superseded_path.unlink(missing_ok=True)
+
+    async def _discard(self, job: IngestionJob, state: _RunState) -> None:
+        """
+        Drop vectors of a rolled-back job and mark its document failed. Its
+        near-duplicate entries were never published, so they need no undo.
+        """
+        await asyncio.to_thread(VectorStore.get_default().remove_parents, state.indexed)
+        # Results cached while the job ran may reference its vectors
+        await RetrievalCache.invalidate_default()
+        if job.document_id is None:
+            return
+        try:
+            async with SessionLocal() as db:
+                await DocumentService.update_status(
+                    db, job.document_id, IngestionStatus.FAILED)
+        except Exception:
+            # The job error is what gets reported; keep it
+            pass
+
+    def _new_queue(self) -> "queue.Queue":
+        if self._manager is not None:
+            return self._manager.Queue(maxsize=self.max_buffered_batches)
+        return queue.Queue(maxsize=self.max_buffered_batches)
+
+    async def _persist(
+        self,
+        job: IngestionJob,
+        db: AsyncSession,
+        result: IngestionResult,
+        state: _RunState
+    ) -> None:
+        """
+        Store a batch of parent chunks in one bulk insert within the job's
+        transaction, then embed the children of newly stored parents into
+        the vector store. Chunks the previous version already holds are
+        reused and only re-positioned; new chunks are checked for near
+        duplicates per settings.NEAR_DUPLICATE_POLICY.
+        """
+        for stage, seconds in result["timings"].items():
+            metrics.observe(stage, seconds)
+
+        chunks = [ParentChunkCreate(**data) for data in result["parent_chunk_data"]]
+        batch_stored: Dict[str, UUID] = {}
+        new_chunks: List[ParentChunkCreate] = []
+        for chunk in chunks:
+            row = state.previous.get(chunk.content_hash)
+            if row is None:
+                new_chunks.append(chunk)
+                continue
+            if chunk.content_hash not in state.stored and (
+                _position(row.chunk_index, row.metadata)
+                != _position(chunk.chunk_index, chunk.metadata)
+            ):
+                # The reused row keeps its ID; the split assigned a new one
+                state.moved.append({
+                    "id": row.id,
+                    "chunk_index": chunk.chunk_index,
+                    "metadata": {**chunk.metadata, "id": str(row.id)}
+                })
+            batch_stored[chunk.content_hash] = row.id
+            state.stored[chunk.content_hash] = row.id
+
+        children = result["child_chunks"]
+        policy = _near_duplicate_policy()
+        if policy != NearDuplicatePolicy.OFF and new_chunks:
+            skipped = await self._match_near_duplicates(job, new_chunks, state, policy)
+            if skipped:
+                skipped_ids = {str(chunk.id) for chunk in chunks if chunk.content_hash in skipped}
+                chunks = [chunk for chunk in chunks if chunk.content_hash not in skipped]
+                new_chunks = [chunk for chunk in new_chunks if chunk.content_hash not in skipped]
+                children = [child for child in children if child.parent_id not in skipped_ids]
+
+        batch_stored.update(await ParentChunkService.bulk_create(
+            db, new_chunks, job.document_id, commit=False))
+        state.stored.update(batch_stored)
+
+        # Point children of deduplicated parents at the row already stored
+        remapped = {
+            str(chunk.id): str(batch_stored[chunk.content_hash])
+            for chunk in chunks
+            if str(batch_stored[chunk.content_hash]) != str(chunk.id)
+        }
+
+        # Children of deduplicated parents are already indexed
+        new_children = [
+            child for child in children
+            if child.parent_id not in remapped
+        ]
+        for child in children:
+            if child.parent_id in remapped:
+                child.parent_id = remapped[child.parent_id]
+        if new_children:
+            with span("ingest.embed"):
+                vectors = await EmbedderFactory.get_default().embed(
+                    [child.text for child in new_children])
+            parent_ids = [str(child.parent_id) for child in new_children]
+            # Appending may rebuild the IVF index; keep it off the event loop
+            with span("ingest.vector_add"):
+                await asyncio.to_thread(
+                    VectorStore.get_default().add,
+                    vectors,
+                    parent_ids=parent_ids,
+                    child_ids=[child.id for child in new_children]
+                )
+            state.indexed.extend(parent_ids)
+
+        job.parent_chunk_count += len(chunks)
+        job.child_chunk_count += len(children)
+        job.duplicate_chunk_count += len(remapped)
+        metrics.INGESTED_CHUNKS.labels("parent").inc(len(chunks))
+        metrics.INGESTED_CHUNKS.labels("child").inc(len(children))
+        metrics.INGESTED_CHUNKS.labels("duplicate").inc(len(remapped))
+
+    async def _match_near_duplicates(
+        self,
+        job: IngestionJob,
+        chunks: List[ParentChunkCreate],
+        state: _RunState,
+        policy: NearDuplicatePolicy
+    ) -> Set[str]:
+        """
+        Look new parents up in the shared near-duplicate index, then in the
+        job's own canonical parents; parents without a match become
+        canonical entries of the job. Matched parents get
+        near_duplicate_of set (CLUSTER) or are dropped together with their
+        children (SKIP). SKIP only applies to matches within the document:
+        a match in the shared index belongs to another document, which may
+        later be deleted or re-ingested without the passage, so such
+        parents are always stored and clustered.
+
+        Returns:
+            content_hash of every parent to skip
+        """
+        pending: Dict[str, ParentChunkCreate] = {}
+        for chunk in chunks:
+            # Exact duplicates are already resolved by content_hash
+            if (
+                chunk.minhash is None
+                or chunk.content_hash in state.stored
+                or chunk.content_hash in pending
+            ):
+                continue
+            pending[chunk.content_hash] = chunk
+        if not pending:
+            return set()
+
+        candidates = list(pending.values())
+        signatures = np.stack([
+            np.frombuffer(chunk.minhash, dtype=np.uint32) for chunk in candidates])
+        # A re-ingested document must not match the version it replaces
+        exclude = {str(row.id) for row in state.previous.values()}
+        shared = NearDuplicateIndex.get_default()
+        if state.near_duplicates is None:
+            state.near_duplicates = NearDuplicateIndex(
+                shared.num_perm, bands=shared.bands, threshold=shared.threshold)
+        with span("ingest.near_duplicates"):
+            matches = await asyncio.to_thread(shared.match, signatures, exclude)
+            unmatched = [i for i, match in enumerate(matches) if match is None]
+            own_matches: List[Optional[str]] = []
+            if unmatched:
+                own_matches = await asyncio.to_thread(
+                    state.near_duplicates.match_or_add,
+                    [str(candidates[i].id) for i in unmatched],
+                    signatures[unmatched]
+                )
+        # Only matches among the job's own parents are in the same document
+        same_document = {
+            i for i, match in zip(unmatched, own_matches) if match is not None}
+        for i, match in zip(unmatched, own_matches):
+            matches[i] = match
+
+        skipped: Set[str] = set()
+        for i, (chunk, match) in enumerate(zip(candidates, matches)):
+            if match is None:
+                continue
+            if policy == NearDuplicatePolicy.SKIP and i in same_document:
+                skipped.add(chunk.content_hash)
+            else:
+                chunk.near_duplicate_of = UUID(match)
+        matched = sum(match is not None for match in matches)
+        job.near_duplicate_chunk_count += matched
+        metrics.INGESTED_CHUNKS.labels("near_duplicate").inc(matched)
+        return skipped
+
+    def _remember(self, job: IngestionJob) -> None:
+        self._jobs[job.id] = job
+        # Evict the oldest finished jobs once history is full
+        if len(self._jobs) <= self.history_size:
+            return
+        for job_id, old_job in list(self._jobs.items()):
+            if len(self._jobs) <= self.history_size:
+                break
+            if old_job.status in (IngestionStatus.COMPLETED, IngestionStatus.FAILED):
+                del self._jobs[job_id]
+
+
+def _position(chunk_index: int, metadata: Optional[Dict[str, Any]]) -> Tuple[Any, ...]:
+    """
+    Where a chunk sits in its document. The span "id" and loader "source"
+    differ on every upload, so comparing whole metadata would re-position
+    every reused chunk.
+    """
+    metadata = metadata or {}
+    return (chunk_index, *(metadata.get(key) for key in POSITION_METADATA_KEYS))
+
+
+async def _save_with_retry(save: Callable[[], None], name: str) -> None:
+    """Run a blocking save off the event loop, retrying before logging the failure."""
+    for attempt in range(1, SAVE_ATTEMPTS + 1):
+        try:
+            await asyncio.to_thread(save)
+            return
+        except Exception:
+            if attempt == SAVE_ATTEMPTS:
+                logger.exception("Failed to save the %s after %d attempts", name, attempt)
+                return
+            await asyncio.sleep(SAVE_RETRY_DELAY * attempt)
+
+
+def _near_duplicate_policy() -> NearDuplicatePolicy:
+    return NearDuplicatePolicy(settings.NEAR_DUPLICATE_POLICY)
+
+
+def _drain(batches: "queue.Queue") -> None:
+    """Discard batches until the producer's closing None."""
+    while batches.get() is not None:
+        pass
+
+
+async def _stop_producer(job: IngestionJob, producer: "asyncio.Future", batches: "queue.Queue") -> None:
+    """
+    Wind down the producer of a job whose consumer failed: drain the queue
+    so it never blocks on a full one, and wait for it so its worker is free
+    before the job gives up its slot. The consumer's error is the one the
+    job reports; the producer's is only logged.
+    """
+    drained = asyncio.get_running_loop().run_in_executor(None, _drain, batches)
+    try:
+        await producer
+    except Exception:
+        logger.warning("Producer of failed ingestion job %s raised", job.id, exc_info=True)
+    # A worker that died never put its closing None; release the drain
+    await asyncio.to_thread(batches.put, None)
+    await drained
+
+
+# Shared instance used by the upload endpoint and the application lifespan
+ingestion_service = IngestionService()
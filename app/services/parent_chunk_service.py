@@ -1,17 +1,63 @@
-from typing import List, Optional
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import Integer, column, delete, func, select, and_, tuple_, update, values
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID, insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 
-from app.models.parent_chunk import ParentChunk
-from app.schemas.parent_chunk import ParentChunkCreate, ParentChunkUpdate
+from app.config import settings
+from app.core.metrics import span
+from app.models.parent_chunk import SEARCH_CONFIG, ParentChunk
+from app.schemas.parent_chunk import ParentChunkCreate, ParentChunkResponse, ParentChunkUpdate
+from app.utils.cache import LRUCache
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# asyncpg caps a statement at 32767 bind parameters; with 10 columns per row
+# this keeps every multi-row INSERT comfortably below the limit
+BULK_INSERT_BATCH_SIZE = 2000
+
+# id -> hydrated parent chunk, so retrieval of popular parents skips the
+# database. Entries are dropped when this process updates or deletes the
+# chunk; the TTL bounds staleness from changes made by other processes.
+parent_cache: LRUCache[UUID, ParentChunkResponse] = LRUCache(
+    max_size=settings.PARENT_CACHE_SIZE,
+    ttl=settings.PARENT_CACHE_TTL
+)
+
+
+# Rows fetched per round trip when streaming exports
+STREAM_BATCH_SIZE = 1000
+
+# Columns returned by lightweight listings: everything except `content`
+SUMMARY_COLUMNS = (
+    ParentChunk.id,
+    ParentChunk.document_id,
+    ParentChunk.content_hash,
+    ParentChunk.near_duplicate_of,
+    ParentChunk.chunk_index,
+    ParentChunk.token_count,
+    ParentChunk.char_count,
+    ParentChunk.chunk_metadata.label("metadata"),
+    ParentChunk.created_at,
+    ParentChunk.updated_at,
+)
+
+
+def _to_model_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map schema field names onto ParentChunk attribute names."""
+    if "metadata" in data:
+        data["chunk_metadata"] = data.pop("metadata")
+    if "id" in data and data["id"] is None:
+        del data["id"]
+    return data
 
 
 class ParentChunkService:
     """Service class for parent chunk operations"""
     
     @staticmethod
+    @span("db.create")
     async def create(db: AsyncSession, chunk_data: ParentChunkCreate) -> ParentChunk:
         """
         Create a new parent chunk.
@@ -26,13 +72,223 @@ class ParentChunkService:
         Raises:
             IntegrityError: If duplicate content_hash exists
         """
-        chunk = ParentChunk(**chunk_data.model_dump())
+        chunk = ParentChunk(**_to_model_fields(chunk_data.model_dump()))
         db.add(chunk)
         await db.commit()
         await db.refresh(chunk)
         return chunk
     
     @staticmethod
+    @span("db.bulk_create")
+    async def bulk_create(
+        db: AsyncSession,
+        chunks: List[ParentChunkCreate],
+        document_id: Optional[UUID] = None,
+        commit: bool = True
+    ) -> Dict[str, UUID]:
+        """
+        Insert many parent chunks of one document using multi-row
+        INSERT ... ON CONFLICT (document_id, content_hash) DO NOTHING RETURNING.
+        
+        Duplicates (already stored or repeated within the batch) are skipped
+        instead of raising IntegrityError. Hashes already stored are resolved
+        up front with one batched SELECT and never sent in the INSERT.
+        
+        Args:
+            db: Database session
+            chunks: Parent chunk creation data, typically a whole document
+            document_id: Document the chunks belong to, or None for chunks
+                without a source document
+            commit: Commit when done. Pass False to make the insert part of
+                a larger transaction, as ingestion does.
+            
+        Returns:
+            Mapping of every input content_hash to the ID of the stored row,
+            whether it was inserted now or already existed
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        for chunk_data in chunks:
+            if chunk_data.content_hash in rows:
+                continue
+            row = chunk_data.model_dump()
+            if row["id"] is None:
+                row["id"] = uuid.uuid4()
+            row["document_id"] = document_id
+            rows[chunk_data.content_hash] = row
+        
+        if not rows:
+            return {}
+        
+        stored = await _select_ids_by_hashes(db, list(rows.keys()), document_id)
+        values = [row for content_hash, row in rows.items() if content_hash not in stored]
+        
+        table = ParentChunk.__table__
+        for start in range(0, len(values), BULK_INSERT_BATCH_SIZE):
+            stmt = (
+                pg_insert(table)
+                .values(values[start:start + BULK_INSERT_BATCH_SIZE])
+                .on_conflict_do_nothing(
+                    index_elements=[table.c.document_id, table.c.content_hash])
+                .returning(table.c.content_hash, table.c.id)
+            )
+            result = await db.execute(stmt)
+            stored.update({content_hash: chunk_id for content_hash, chunk_id in result.all()})
+        
+        # Rows inserted concurrently by another transaction were skipped by
+        # ON CONFLICT; resolve their IDs too
+        skipped = [content_hash for content_hash in rows if content_hash not in stored]
+        if skipped:
+            stored.update(await _select_ids_by_hashes(db, skipped, document_id))
+        
+        if commit:
+            await db.commit()
+        return stored
+    
+    @staticmethod
+    @span("db.delete_by_document")
+    async def delete_by_document(
+        db: AsyncSession,
+        document_id: UUID,
+        commit: bool = True
+    ) -> List[UUID]:
+        """
+        Delete every parent chunk of a document in a single DELETE statement.
+        
+        Args:
+            db: Database session
+            document_id: UUID of the document
+            commit: Commit when done. Pass False to make the delete part of
+                a larger transaction, e.g. replace_document; the caller
+                then passes the returned IDs to forget() once it commits.
+            
+        Returns:
+            IDs of the deleted chunks, so their vectors can be dropped
+        """
+        result = await db.execute(
+            delete(ParentChunk)
+            .where(ParentChunk.document_id == document_id)
+            .returning(ParentChunk.id)
+        )
+        deleted = list(result.scalars().all())
+        if commit:
+            await db.commit()
+            ParentChunkService.forget(deleted)
+        return deleted
+    
+    @staticmethod
+    @span("db.delete_by_ids")
+    async def delete_by_ids(
+        db: AsyncSession,
+        chunk_ids: List[UUID],
+        commit: bool = True
+    ) -> int:
+        """
+        Delete many parent chunks with one DELETE ... WHERE id IN (...) per
+        BULK_INSERT_BATCH_SIZE IDs.
+        
+        Args:
+            db: Database session
+            chunk_ids: UUIDs of the chunks to delete
+            commit: Commit when done. Pass False to make the delete part of
+                a larger transaction; the caller then passes chunk_ids to
+                forget() once it commits.
+            
+        Returns:
+            Number of chunks deleted
+        """
+        deleted = 0
+        for start in range(0, len(chunk_ids), BULK_INSERT_BATCH_SIZE):
+            result = await db.execute(
+                delete(ParentChunk)
+                .where(ParentChunk.id.in_(chunk_ids[start:start + BULK_INSERT_BATCH_SIZE]))
+            )
+            deleted += result.rowcount
+        if commit:
+            await db.commit()
+            ParentChunkService.forget(chunk_ids)
+        return deleted
+    
+    @staticmethod
+    @span("db.update_positions")
+    async def update_positions(
+        db: AsyncSession,
+        positions: List[Dict[str, Any]],
+        commit: bool = True
+    ) -> int:
+        """
+        Set chunk_index and metadata of many parent chunks with one
+        UPDATE ... FROM (VALUES ...) per BULK_INSERT_BATCH_SIZE rows.
+        
+        Args:
+            db: Database session
+            positions: Dicts with "id", "chunk_index" and "metadata" keys
+            commit: Commit when done. Pass False to make the update part of
+                a larger transaction; the caller then passes the IDs to
+                forget() once it commits.
+            
+        Returns:
+            Number of chunks updated
+        """
+        updated = 0
+        for start in range(0, len(positions), BULK_INSERT_BATCH_SIZE):
+            moved = values(
+                column("id", PG_UUID(as_uuid=True)),
+                column("chunk_index", Integer),
+                column("metadata", JSONB),
+                name="moved"
+            ).data([
+                (position["id"], position["chunk_index"], position["metadata"])
+                for position in positions[start:start + BULK_INSERT_BATCH_SIZE]
+            ])
+            result = await db.execute(
+                update(ParentChunk)
+                .where(ParentChunk.id == moved.c.id)
+                .values(chunk_index=moved.c.chunk_index, chunk_metadata=moved.c.metadata)
+                .execution_options(synchronize_session=False)
+            )
+            updated += result.rowcount
+        if commit:
+            await db.commit()
+            ParentChunkService.forget([position["id"] for position in positions])
+        return updated
+    
+    @staticmethod
+    def forget(chunk_ids: Iterable[UUID]) -> None:
+        """
+        Drop chunks from the parent cache. Called once a change to them is
+        committed: dropping them earlier lets a concurrent read cache the
+        old row again before the commit.
+        """
+        parent_cache.pop_many(chunk_ids)
+    
+    @staticmethod
+    @span("db.replace_document")
+    async def replace_document(
+        db: AsyncSession,
+        document_id: UUID,
+        chunks: List[ParentChunkCreate]
+    ) -> Tuple[Dict[str, UUID], List[UUID]]:
+        """
+        Atomically swap a document's parent chunks for a new set: one DELETE
+        plus the bulk INSERT, committed together, so readers see either the
+        old or the new version and never a mix.
+        
+        Args:
+            db: Database session
+            document_id: UUID of the document
+            chunks: The document's complete new set of parent chunks
+            
+        Returns:
+            Tuple of (content_hash -> ID of the new rows, IDs of the removed rows)
+        """
+        removed = await ParentChunkService.delete_by_document(db, document_id, commit=False)
+        stored = await ParentChunkService.bulk_create(db, chunks, document_id, commit=False)
+        await db.commit()
+        ParentChunkService.forget(removed)
+        return stored, removed
+    
+    @staticmethod
+    @span("db.get_by_id")
     async def get_by_id(db: AsyncSession, chunk_id: UUID) -> Optional[ParentChunk]:
         """
         Get parent chunk by ID.
@@ -50,40 +306,123 @@ class ParentChunkService:
         return result.scalar_one_or_none()
     
     @staticmethod
-    async def get_by_content_hash(db: AsyncSession, content_hash: str) -> Optional[ParentChunk]:
+    @span("db.get_by_content_hash")
+    async def get_by_content_hash(
+        db: AsyncSession,
+        content_hash: str,
+        document_id: Optional[UUID] = None
+    ) -> Optional[ParentChunk]:
         """
         Get parent chunk by content hash (for deduplication).
         
         Args:
             db: Database session
             content_hash: SHA-256 hash of content
+            document_id: Document to look in, or None for chunks without one
             
         Returns:
             ParentChunk instance or None
         """
         result = await db.execute(
-            select(ParentChunk).where(ParentChunk.content_hash == content_hash)
+            select(ParentChunk)
+            .where(ParentChunk.document_id.is_not_distinct_from(document_id))
+            .where(ParentChunk.content_hash == content_hash)
         )
         return result.scalar_one_or_none()
     
     @staticmethod
+    @span("db.get_by_ids")
     async def get_by_ids(db: AsyncSession, chunk_ids: List[UUID]) -> List[ParentChunk]:
         """
         Get multiple parent chunks by IDs (bulk retrieval for vector search results).
         
         Args:
             db: Database session
-            chunk_ids: List of chunk UUIDs
+            chunk_ids: List of chunk UUIDs, e.g. best search hit first
             
         Returns:
-            List of ParentChunk instances
+            ParentChunk instances in the order of chunk_ids, without
+            duplicates; IDs that do not exist are skipped
         """
+        chunk_ids = list(dict.fromkeys(chunk_ids))
+        if not chunk_ids:
+            return []
         result = await db.execute(
             select(ParentChunk).where(ParentChunk.id.in_(chunk_ids))
         )
-        return list(result.scalars().all())
+        # IN (...) returns rows in arbitrary order
+        by_id = {chunk.id: chunk for chunk in result.scalars().all()}
+        return [by_id[chunk_id] for chunk_id in chunk_ids if chunk_id in by_id]
+    
+    @staticmethod
+    @span("db.hydrate")
+    async def hydrate(db: AsyncSession, chunk_ids: List[UUID]) -> List[ParentChunkResponse]:
+        """
+        Like get_by_ids, but served from the parent cache where possible;
+        only cache misses are fetched, in one query.
+        
+        Args:
+            db: Database session
+            chunk_ids: List of chunk UUIDs, e.g. best search hit first
+            
+        Returns:
+            ParentChunkResponse objects in the order of chunk_ids, without
+            duplicates; IDs that do not exist are skipped
+        """
+        chunk_ids = list(dict.fromkeys(chunk_ids))
+        found: Dict[UUID, ParentChunkResponse] = {}
+        missing: List[UUID] = []
+        for chunk_id in chunk_ids:
+            cached = parent_cache.get(chunk_id)
+            if cached is None:
+                missing.append(chunk_id)
+            else:
+                found[chunk_id] = cached
+        
+        for chunk in await ParentChunkService.get_by_ids(db, missing):
+            response = ParentChunkResponse.model_validate(chunk)
+            parent_cache.set(chunk.id, response)
+            found[chunk.id] = response
+        return [found[chunk_id] for chunk_id in chunk_ids if chunk_id in found]
     
     @staticmethod
+    @span("db.search")
+    async def search(
+        db: AsyncSession,
+        query: str,
+        limit: int = 10,
+        document_id: Optional[UUID] = None
+    ) -> List[Tuple[UUID, float]]:
+        """
+        Full-text search over chunk content using the GIN-indexed
+        search_vector column, ranked by ts_rank_cd (cover density).
+        
+        The query uses websearch syntax: quoted phrases, OR and -term.
+        
+        Args:
+            db: Database session
+            query: User search text
+            limit: Maximum number of results
+            document_id: Restrict the search to one document
+            
+        Returns:
+            (chunk_id, rank) pairs, best match first
+        """
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(ParentChunk.search_vector, ts_query)
+        stmt = (
+            select(ParentChunk.id, rank.label("rank"))
+            .where(ParentChunk.search_vector.op("@@")(ts_query))
+            .order_by(rank.desc(), ParentChunk.id)
+            .limit(limit)
+        )
+        if document_id is not None:
+            stmt = stmt.where(ParentChunk.document_id == document_id)
+        result = await db.execute(stmt)
+        return [(chunk_id, float(score)) for chunk_id, score in result.all()]
+    
+    @staticmethod
+    @span("db.get_all")
     async def get_all(
         db: AsyncSession, 
         skip: int = 0, 
@@ -112,6 +451,110 @@ class ParentChunkService:
         return list(result.scalars().all())
     
     @staticmethod
+    @span("db.get_page")
+    async def get_page(
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        summary: bool = False
+    ) -> Tuple[Sequence[Any], Optional[str]]:
+        """
+        Get a page of parent chunks ordered by (chunk_index, id) using keyset
+        pagination, so cost does not grow with how deep the page is.
+        
+        Args:
+            db: Database session
+            limit: Maximum number of records to return
+            cursor: Opaque cursor from the previous page, or None for the first
+            summary: Select only SUMMARY_COLUMNS (no content) for listing views
+            
+        Returns:
+            Tuple of (rows, next_cursor). Rows are ParentChunk instances, or
+            rows of SUMMARY_COLUMNS when summary is set. next_cursor is None
+            on the last page.
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = select(*SUMMARY_COLUMNS) if summary else select(ParentChunk)
+        
+        if cursor is not None:
+            values = decode_cursor(cursor)
+            try:
+                chunk_index, chunk_id = int(values[0]), UUID(values[1])
+            except (IndexError, TypeError, ValueError) as e:
+                raise ValueError("Invalid cursor") from e
+            query = query.where(
+                tuple_(ParentChunk.chunk_index, ParentChunk.id) > tuple_(chunk_index, chunk_id)
+            )
+        
+        # Fetch one extra row to know whether another page exists
+        query = query.order_by(ParentChunk.chunk_index, ParentChunk.id).limit(limit + 1)
+        result = await db.execute(query)
+        rows = list(result.all() if summary else result.scalars().all())
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor([last.chunk_index, str(last.id)])
+        return rows, next_cursor
+    
+    @staticmethod
+    @span("db.get_document_index")
+    async def get_document_index(db: AsyncSession, document_id: UUID) -> Dict[str, Any]:
+        """
+        Get the stored chunk layout of a document for diffing against a new
+        version: id, chunk_index and metadata, without content.
+        
+        Args:
+            db: Database session
+            document_id: UUID of the document
+            
+        Returns:
+            Mapping of content_hash to a row with id, chunk_index and metadata
+        """
+        result = await db.execute(
+            select(
+                ParentChunk.content_hash,
+                ParentChunk.id,
+                ParentChunk.chunk_index,
+                ParentChunk.chunk_metadata.label("metadata")
+            )
+            .where(ParentChunk.document_id == document_id)
+            .order_by(ParentChunk.chunk_index)
+        )
+        return {row.content_hash: row for row in result.all()}
+    
+    @staticmethod
+    async def stream_all(
+        db: AsyncSession,
+        summary: bool = False,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[Sequence[Any]]:
+        """
+        Stream every parent chunk in (chunk_index, id) order through a
+        server-side cursor, without building ORM objects.
+        
+        Args:
+            db: Database session, held open for the whole iteration
+            summary: Select only SUMMARY_COLUMNS (no content)
+            batch_size: Rows fetched from the cursor per round trip
+            
+        Yields:
+            Batches of at most batch_size rows
+        """
+        columns = SUMMARY_COLUMNS if summary else (*SUMMARY_COLUMNS, ParentChunk.content)
+        result = await db.stream(
+            select(*columns)
+            .order_by(ParentChunk.chunk_index, ParentChunk.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield partition
+    
+    @staticmethod
+    @span("db.update")
     async def update(
         db: AsyncSession, 
         chunk_id: UUID, 
@@ -132,15 +575,17 @@ class ParentChunkService:
         if not chunk:
             return None
         
-        update_dict = update_data.model_dump(exclude_unset=True)
+        update_dict = _to_model_fields(update_data.model_dump(exclude_unset=True))
         for field, value in update_dict.items():
             setattr(chunk, field, value)
         
         await db.commit()
+        parent_cache.pop(chunk_id)
         await db.refresh(chunk)
         return chunk
     
     @staticmethod
+    @span("db.delete")
     async def delete(db: AsyncSession, chunk_id: UUID) -> bool:
         """
         Delete a parent chunk.
@@ -158,19 +603,84 @@ class ParentChunkService:
         
         await db.delete(chunk)
         await db.commit()
+        parent_cache.pop(chunk_id)
         return True
     
     @staticmethod
-    async def exists_by_hash(db: AsyncSession, content_hash: str) -> bool:
+    @span("db.get_ids_by_hashes")
+    async def get_ids_by_hashes(
+        db: AsyncSession,
+        content_hashes: Iterable[str],
+        document_id: Optional[UUID] = None
+    ) -> Dict[str, UUID]:
+        """
+        Resolve content hashes to chunk IDs for those that are stored.
+        
+        Looks the hashes up with SELECTs of only the hash and id columns,
+        BULK_INSERT_BATCH_SIZE hashes at a time.
+        
+        Args:
+            db: Database session
+            content_hashes: SHA-256 hashes of content
+            document_id: Document to look in, or None for chunks without one
+            
+        Returns:
+            Mapping of content_hash to ID for every hash that exists
+        """
+        return await _select_ids_by_hashes(db, list(set(content_hashes)), document_id)
+    
+    @staticmethod
+    async def get_existing_hashes(
+        db: AsyncSession,
+        content_hashes: Iterable[str],
+        document_id: Optional[UUID] = None
+    ) -> Set[str]:
+        """
+        Batched existence check for content hashes.
+        
+        Args:
+            db: Database session
+            content_hashes: SHA-256 hashes of content
+            document_id: Document to look in, or None for chunks without one
+            
+        Returns:
+            The subset of content_hashes that already exist
+        """
+        return set(await ParentChunkService.get_ids_by_hashes(db, content_hashes, document_id))
+    
+    @staticmethod
+    async def exists_by_hash(
+        db: AsyncSession,
+        content_hash: str,
+        document_id: Optional[UUID] = None
+    ) -> bool:
         """
         Check if a chunk with given content hash already exists.
         
         Args:
             db: Database session
             content_hash: SHA-256 hash of content
+            document_id: Document to look in, or None for chunks without one
             
         Returns:
             True if exists, False otherwise
         """
-        chunk = await ParentChunkService.get_by_content_hash(db, content_hash)
-        return chunk is not None
+        return content_hash in await ParentChunkService.get_existing_hashes(
+            db, [content_hash], document_id)
+
+
+async def _select_ids_by_hashes(
+    db: AsyncSession,
+    content_hashes: List[str],
+    document_id: Optional[UUID]
+) -> Dict[str, UUID]:
+    """Look up chunk IDs by content hash within one document."""
+    found: Dict[str, UUID] = {}
+    for start in range(0, len(content_hashes), BULK_INSERT_BATCH_SIZE):
+        result = await db.execute(
+            select(ParentChunk.content_hash, ParentChunk.id)
+            .where(ParentChunk.document_id.is_not_distinct_from(document_id))
+            .where(ParentChunk.content_hash.in_(content_hashes[start:start + BULK_INSERT_BATCH_SIZE]))
+        )
+        found.update({content_hash: chunk_id for content_hash, chunk_id in result.all()})
+    return found
@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Thread-safe, size-bounded LRU cache with an optional per-entry TTL.
+    
+    Args:
+        max_size: Maximum number of entries kept; least recently used are evicted
+        ttl: Seconds an entry stays valid, or None to never expire
+    """
+    
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[K, Tuple[V, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: K, value: V) -> None:
+        """Insert or refresh an entry, evicting the oldest if full"""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+    
+    def pop(self, key: K) -> None:
+        """Remove an entry if present"""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def pop_many(self, keys: Iterable[K]) -> None:
+        """Remove several entries if present"""
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
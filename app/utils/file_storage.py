@@ -0,0 +1,114 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+from fastapi import UploadFile
+
+from app.core.exceptions import PayloadTooLargeException
+
+# Read uploads in 1MB pieces so memory use is independent of file size
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class StoredFile:
+    """Result of streaming an upload to disk"""
+    path: Path
+    size: int
+    sha256: str
+    # First and last bytes of the file, kept for type detection
+    head: bytes = b""
+    tail: bytes = b""
+
+
+async def stream_upload_to_disk(
+    file: UploadFile,
+    destination: Path,
+    max_size: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    head_size: int = 0,
+    tail_size: int = 0
+) -> StoredFile:
+    """
+    Stream an upload to disk in fixed-size chunks, hashing as it goes.
+
+    Only one chunk is held in memory at a time and file writes run in a
+    worker thread so the event loop is never blocked on disk I/O. The first
+    head_size and last tail_size bytes are kept as they pass, so callers can
+    inspect them without reading the file back.
+
+    Args:
+        file: The incoming upload
+        destination: Path to write the file to
+        max_size: Maximum allowed size in bytes
+        chunk_size: Number of bytes to read per iteration
+        head_size: Number of leading bytes to keep
+        tail_size: Number of trailing bytes to keep
+
+    Returns:
+        StoredFile with the written path, size in bytes, SHA-256 hex digest
+        and the kept head and tail bytes
+
+    Raises:
+        PayloadTooLargeException: As soon as more than max_size bytes are read;
+            the partially written file is removed
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    head = b""
+    tail = b""
+    out = await asyncio.to_thread(open, destination, "wb")
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise PayloadTooLargeException(
+                    f"File size exceeds maximum allowed size of {max_size} bytes"
+                )
+            hasher.update(chunk)
+            if len(head) < head_size:
+                head += chunk[:head_size - len(head)]
+            if tail_size:
+                tail = chunk[-tail_size:] if len(chunk) >= tail_size else (tail + chunk)[-tail_size:]
+            await asyncio.to_thread(out.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(out.close)
+        destination.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(out.close)
+
+    return StoredFile(
+        path=destination, size=size, sha256=hasher.hexdigest(), head=head, tail=tail)
+
+
+def atomic_write(target: Path, write: Callable[[BinaryIO], Any]) -> None:
+    """
+    Write a file through a uniquely named temporary file in the same
+    directory and rename it over `target`, so readers never observe a
+    half-written file and concurrent writers never share a temporary file.
+
+    Args:
+        target: Path of the file to replace
+        write: Called with the open temporary file to write its contents
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=target.parent, prefix=f".{target.name}.", suffix=".tmp", delete=False
+    ) as tmp:
+        try:
+            write(tmp)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    try:
+        os.replace(tmp.name, target)
+    except BaseException:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
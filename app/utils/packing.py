@@ -0,0 +1,36 @@
+from typing import List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def pack_to_budget(
+    items: Sequence[T],
+    costs: Sequence[int],
+    budget: Optional[int],
+    overhead: int = 0
+) -> Tuple[List[T], int]:
+    """
+    Greedily fill a token budget with best-first items.
+
+    Items are taken in order while they fit. An item too large for the
+    remaining budget is skipped rather than ending the packing, so a
+    smaller, lower-ranked item can still use the space.
+
+    Args:
+        items: Items ordered best first
+        costs: Token count of each item
+        budget: Total tokens available, or None to take every item
+        overhead: Extra tokens each packed item costs, e.g. separators
+
+    Returns:
+        Tuple of (the packed items in their original order, tokens they
+        use including overhead)
+    """
+    packed: List[T] = []
+    used = 0
+    for item, cost in zip(items, costs):
+        cost += overhead
+        if budget is None or used + cost <= budget:
+            packed.append(item)
+            used += cost
+    return packed, used
@@ -0,0 +1,25 @@
+from typing import Dict, Hashable, List, Sequence, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[T]], k: int = 60) -> List[T]:
+    """
+    Merge several best-first rankings with reciprocal rank fusion.
+    
+    Each item scores sum(1 / (k + rank)) over the rankings it appears in
+    (rank starting at 1), so only positions matter and scores from
+    different retrievers need not be comparable.
+    
+    Args:
+        rankings: Best-first lists of item identifiers
+        k: Damping constant; larger values flatten the advantage of top ranks
+        
+    Returns:
+        Every item from the rankings, best fused score first
+    """
+    scores: Dict[T, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=scores.__getitem__, reverse=True)
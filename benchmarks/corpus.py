@@ -0,0 +1,135 @@
+"""
+Synthetic corpus generator for ingestion benchmarks.
+
+Produces TXT, PDF and DOCX files of configurable size from a seeded word
+list, without any third-party writer libraries: PDFs are written as plain
+text content streams and DOCX files as a minimal OOXML zip.
+"""
+import random
+import zipfile
+from pathlib import Path
+from typing import List
+from xml.sax.saxutils import escape
+
+WORDS = (
+    "the of and to in is that for it as with was on be by this are from at or "
+    "an have not which but all were when we there can more if will each about "
+    "system data model retrieval document chunk vector index query latency "
+    "throughput memory storage parser page section result token embedding "
+    "notebook source summary analysis report method value process network"
+).split()
+
+LINES_PER_PAGE = 55
+WORDS_PER_LINE = 14
+
+
+def _paragraphs(rng: random.Random, pages: int) -> List[List[str]]:
+    """Generate `pages` pages of text lines, with blank lines between paragraphs."""
+    out = []
+    for _ in range(pages):
+        lines = []
+        for line_no in range(LINES_PER_PAGE):
+            if line_no % 8 == 7:
+                lines.append("")
+                continue
+            words = rng.choices(WORDS, k=WORDS_PER_LINE)
+            lines.append(" ".join(words).capitalize() + ".")
+        out.append(lines)
+    return out
+
+
+def write_txt(path: Path, pages: List[List[str]]) -> None:
+    path.write_text("\n\n".join("\n".join(lines) for lines in pages), encoding="utf-8")
+
+
+def write_docx(path: Path, pages: List[List[str]]) -> None:
+    body = "".join(
+        f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(line)}</w:t></w:r></w:p>"
+        for lines in pages for line in lines
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" ContentType='
+            '"application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'
+        )
+        docx.writestr(
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/officeDocument" Target="word/document.xml"/>'
+            '</Relationships>'
+        )
+        docx.writestr(
+            "word/document.xml",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f"<w:body>{body}</w:body></w:document>"
+        )
+
+
+def write_pdf(path: Path, pages: List[List[str]]) -> None:
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for lines in pages:
+        text = "".join(
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") Tj T* "
+            for line in lines
+        )
+        stream = f"BT /F1 10 Tf 12 TL 40 800 Td {text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_refs))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+WRITERS = {"txt": write_txt, "pdf": write_pdf, "docx": write_docx}
+
+
+def generate_corpus(
+    directory: Path,
+    documents: int,
+    pages: int,
+    types: List[str],
+    seed: int = 0
+) -> List[Path]:
+    """
+    Write `documents` files of `pages` pages each, cycling through `types`.
+
+    Returns:
+        Paths of the generated files
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(documents):
+        doc_type = types[i % len(types)]
+        path = directory / f"doc_{i:05d}.{doc_type}"
+        WRITERS[doc_type](path, _paragraphs(rng, pages))
+        paths.append(path)
+    return paths
@@ -0,0 +1,5 @@
+-- Migration: Add keyset pagination index on parent_chunks
+-- Description: Composite index backing ORDER BY / WHERE (chunk_index, id) > (...) paging
+-- Date: 2026-10-18
+
+CREATE INDEX IF NOT EXISTS idx_parent_chunks_chunk_index_id ON parent_chunks(chunk_index, id);
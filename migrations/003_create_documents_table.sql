@@ -0,0 +1,48 @@
+-- Migration: Create documents table and link parent_chunks to it
+-- Description: Adds a documents table, a document_id foreign key on parent_chunks,
+--              a (document_id, chunk_index) index for per-document deletes and replaces,
+--              and scopes content_hash deduplication to a document
+-- Date: 2026-10-18
+
+-- Create documents table
+CREATE TABLE IF NOT EXISTS documents (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    file_hash VARCHAR(64) NOT NULL,
+    filename VARCHAR(255) NOT NULL,
+    file_path VARCHAR(1024),
+    file_size BIGINT,
+    document_type VARCHAR(16),
+    status VARCHAR(16) NOT NULL DEFAULT 'queued',
+    parent_chunk_count INTEGER NOT NULL DEFAULT 0,
+    child_chunk_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_documents_file_hash ON documents(file_hash);
+
+-- Link parent chunks to their source document; existing rows keep a NULL document_id
+ALTER TABLE parent_chunks
+    ADD COLUMN IF NOT EXISTS document_id UUID REFERENCES documents(id) ON DELETE CASCADE;
+
+CREATE INDEX IF NOT EXISTS idx_parent_chunks_document_id_chunk_index
+    ON parent_chunks(document_id, chunk_index);
+
+-- Deduplicate per document instead of globally (NULLS NOT DISTINCT requires PostgreSQL 15+)
+ALTER TABLE parent_chunks DROP CONSTRAINT IF EXISTS parent_chunks_content_hash_key;
+ALTER TABLE parent_chunks DROP CONSTRAINT IF EXISTS uq_parent_chunks_document_id_content_hash;
+ALTER TABLE parent_chunks
+    ADD CONSTRAINT uq_parent_chunks_document_id_content_hash
+    UNIQUE NULLS NOT DISTINCT (document_id, content_hash);
+
+-- Add comments for documentation
+COMMENT ON TABLE documents IS 'Uploaded source documents; parent_chunks reference the document they were produced from.';
+COMMENT ON COLUMN documents.file_hash IS 'SHA-256 hash of the uploaded file';
+COMMENT ON COLUMN documents.filename IS 'Original filename provided by the user';
+COMMENT ON COLUMN documents.file_path IS 'Path where the uploaded file is stored';
+COMMENT ON COLUMN documents.file_size IS 'Size of the uploaded file in bytes';
+COMMENT ON COLUMN documents.document_type IS 'Document type, e.g. pdf, docx, txt';
+COMMENT ON COLUMN documents.status IS 'Ingestion status: queued, running, completed, failed';
+COMMENT ON COLUMN documents.parent_chunk_count IS 'Number of parent chunks stored for this document';
+COMMENT ON COLUMN documents.child_chunk_count IS 'Number of child chunks for this document';
+COMMENT ON COLUMN parent_chunks.document_id IS 'Document this chunk was produced from';
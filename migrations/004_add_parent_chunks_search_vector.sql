@@ -0,0 +1,13 @@
+-- Migration: Add full-text search to parent_chunks
+-- Description: Adds a generated tsvector column over content and a GIN index for
+--              lexical (ts_rank_cd ranked) retrieval
+-- Date: 2026-10-18
+
+ALTER TABLE parent_chunks
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('english', content)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_parent_chunks_search_vector
+    ON parent_chunks USING GIN (search_vector);
+
+COMMENT ON COLUMN parent_chunks.search_vector IS 'Full-text search vector generated from content';
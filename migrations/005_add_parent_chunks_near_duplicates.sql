@@ -0,0 +1,14 @@
+-- Migration: Add near-duplicate detection columns to parent_chunks
+-- Description: Stores each chunk's MinHash signature and, for chunks detected as
+--              near-duplicates at ingest, the ID of their canonical chunk
+-- Date: 2026-10-18
+
+ALTER TABLE parent_chunks
+    ADD COLUMN IF NOT EXISTS minhash BYTEA,
+    ADD COLUMN IF NOT EXISTS near_duplicate_of UUID;
+
+CREATE INDEX IF NOT EXISTS idx_parent_chunks_near_duplicate_of
+    ON parent_chunks (near_duplicate_of);
+
+COMMENT ON COLUMN parent_chunks.minhash IS 'MinHash signature of content';
+COMMENT ON COLUMN parent_chunks.near_duplicate_of IS 'ID of the canonical chunk this one nearly duplicates';
@@ -0,0 +1,12 @@
+-- Migration: Make active documents unique by file hash
+-- Description: Enforces whole-file upload deduplication in the database, so two
+--              concurrent uploads of the same bytes cannot both register a
+--              document; failed documents are exempt so their files can be uploaded again
+-- Date: 2026-10-18
+
+-- Duplicates registered by concurrent uploads before this migration make the
+-- index creation fail; list them with:
+--   SELECT file_hash, array_agg(id) FROM documents
+--   WHERE status <> 'failed' GROUP BY file_hash HAVING count(*) > 1;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_documents_file_hash_active
+    ON documents(file_hash) WHERE status <> 'failed';
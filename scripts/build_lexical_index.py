@@ -0,0 +1,51 @@
+"""
+Build the in-memory lexical index.
+
+Indexes every parent chunk in DATABASE_URL with BM25 and writes the
+InvertedIndex file used when LEXICAL_BACKEND=memory. The app only loads
+the file at startup: run this before starting it, and again after
+ingesting or deleting documents, then restart.
+
+Usage:
+    python -m scripts.build_lexical_index
+    python -m scripts.build_lexical_index --output /data/lexical_index.bin
+"""
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import List
+
+from app.config import settings
+from app.db.session import ReadSessionLocal
+from app.rag.InvertedIndex import InvertedIndex
+
+
+async def run(args: argparse.Namespace) -> dict:
+    start = time.perf_counter()
+    async with ReadSessionLocal() as db:
+        index = await InvertedIndex.from_database(db)
+    build_seconds = time.perf_counter() - start
+
+    path = Path(args.output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    index.save(path)
+    return {
+        "path": str(path),
+        "chunks": len(index),
+        "terms": len(index.vocabulary),
+        "build_s": round(build_seconds, 3),
+    }
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--output", default=settings.LEXICAL_INDEX_PATH,
+        help="Where to write the index (default: LEXICAL_INDEX_PATH)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(run(parse_args())), indent=2))